@@ -0,0 +1,102 @@
+# djangoAPI/auth_cache.py
+import hashlib
+import threading
+import time
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+# Janela máxima em que um token validado é reaproveitado sem reverificar assinatura.
+TOKEN_CACHE_TTL = 30
+# Janela máxima em que os dados do User autenticado são servidos sem SELECT.
+USER_CACHE_TTL = 60
+
+_token_cache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL)
+_token_lock = threading.Lock()
+
+# Colunas do User guardadas no cache; a senha fica de fora (carregada sob demanda)
+_USER_CACHE_EXCLUDE = frozenset({"password"})
+
+
+def user_cache_enabled() -> bool:
+    """
+    Só com cache compartilhado (Redis): a invalidação ao salvar/remover o User
+    precisa chegar a todos os workers, o que um cache local por processo não faz.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    return not any(name in backend for name in ("locmem", "dummy"))
+
+
+def _user_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    if user_cache_enabled():
+        cache.delete(_user_key(user_id))
+
+
+def on_user_changed(sender, instance=None, user=None, **kwargs):
+    """Receiver de post_save/post_delete/user_logged_in (conectado em UsersConfig.ready)."""
+    obj = instance if instance is not None else user
+    if obj is not None and obj.pk is not None:
+        invalidate_cached_user(obj.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication com cache curto dos tokens já validados e do User.
+    - Token: a chave é o SHA-256 do token (nunca o token cru); a entrada expira
+      em no máximo TOKEN_CACHE_TTL segundos ou no 'exp' do token, o que vier antes.
+    - User: só os valores das colunas (sem a senha) ficam no cache compartilhado,
+      chaveados pelo user_id e apagados ao salvar/remover o User; cada requisição
+      recebe uma instância nova, e is_active é conferido em toda requisição.
+    """
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).digest()
+        now = time.time()
+
+        with _token_lock:
+            hit = _token_cache.get(key)
+        if hit is not None:
+            validated_token, valid_until = hit
+            if now < valid_until:
+                return validated_token
+
+        validated_token = super().get_validated_token(raw_token)
+
+        exp = validated_token.get("exp")
+        valid_until = now + TOKEN_CACHE_TTL
+        if exp is not None:
+            valid_until = min(valid_until, float(exp))
+        with _token_lock:
+            _token_cache[key] = (validated_token, valid_until)
+        return validated_token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        # CHECK_REVOKE_TOKEN compara com o hash da senha, que não vai para o cache
+        if user_id is None or api_settings.CHECK_REVOKE_TOKEN or not user_cache_enabled():
+            return super().get_user(validated_token)
+
+        key = _user_key(user_id)
+        row = cache.get(key)
+        if row is not None:
+            user = self.user_model.from_db(self.user_model.objects.db, list(row), list(row.values()))
+        else:
+            user = super().get_user(validated_token)
+            cache.set(key, {
+                f.attname: getattr(user, f.attname)
+                for f in self.user_model._meta.concrete_fields
+                if f.attname not in _USER_CACHE_EXCLUDE
+            }, USER_CACHE_TTL)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
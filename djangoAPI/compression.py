@@ -0,0 +1,21 @@
+# djangoAPI/compression.py
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """
+    GZip só para respostas JSON com pelo menos GZIP_MIN_LENGTH bytes.
+    Downloads (zip, arquivos) e respostas pequenas passam sem recompressão.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_length = getattr(settings, "GZIP_MIN_LENGTH", 1024)
+
+    def process_response(self, request, response):
+        if response.streaming or "json" not in response.get("Content-Type", ""):
+            return response
+        if len(response.content) < self.min_length:
+            return response
+        return super().process_response(request, response)
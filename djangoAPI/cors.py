@@ -0,0 +1,56 @@
+# djangoAPI/cors.py
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+
+class CorsMiddleware:
+    """
+    CORS mínimo (substitui o django-cors-headers).
+    - Origens permitidas em frozenset (lookup O(1)).
+    - Preflight (OPTIONS + Access-Control-Request-Method) responde direto,
+      sem passar pelo resto do stack, com headers montados no __init__.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.allow_all = settings.CORS_ALLOW_ALL_ORIGINS
+        self.allow_credentials = settings.CORS_ALLOW_CREDENTIALS
+        self.allowed_origins = frozenset(settings.CORS_ALLOWED_ORIGINS)
+        self.preflight_headers = (
+            ("Access-Control-Allow-Headers", ", ".join(settings.CORS_ALLOW_HEADERS)),
+            ("Access-Control-Allow-Methods", ", ".join(settings.CORS_ALLOW_METHODS)),
+            ("Access-Control-Max-Age", str(settings.CORS_PREFLIGHT_MAX_AGE)),
+        )
+
+    def __call__(self, request):
+        origin = request.META.get("HTTP_ORIGIN")
+        if not origin:
+            return self.get_response(request)
+        allowed = self.allow_all or origin in self.allowed_origins
+
+        if request.method == "OPTIONS" and "HTTP_ACCESS_CONTROL_REQUEST_METHOD" in request.META:
+            # preflight sempre responde aqui (como o django-cors-headers), sem
+            # passar por auth/view; origem não permitida fica sem Access-Control-*
+            response = HttpResponse(status=200)
+            response["Content-Length"] = "0"
+            if allowed:
+                for name, value in self.preflight_headers:
+                    response[name] = value
+        else:
+            response = self.get_response(request)
+
+        if not allowed:
+            # a resposta depende do Origin mesmo sem headers CORS: caches na
+            # frente do app não podem reaproveitá-la para uma origem permitida
+            patch_vary_headers(response, ("origin",))
+            return response
+
+        if self.allow_all and not self.allow_credentials:
+            response["Access-Control-Allow-Origin"] = "*"
+        else:
+            response["Access-Control-Allow-Origin"] = origin
+            patch_vary_headers(response, ("origin",))
+        if self.allow_credentials:
+            response["Access-Control-Allow-Credentials"] = "true"
+        return response
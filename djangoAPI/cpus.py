@@ -0,0 +1,10 @@
+# djangoAPI/cpus.py
+import os
+
+
+def available_cpus() -> int:
+    """CPUs que este processo pode usar (respeita affinity/cpuset do container)."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:  # plataformas sem sched_getaffinity
+        return os.cpu_count() or 1
@@ -0,0 +1,25 @@
+# djangoAPI/paths.py
+from pathlib import Path
+from typing import Optional, Union
+
+from django.conf import settings
+
+
+def to_stored_path(path: Union[str, Path]) -> str:
+    """
+    Caminho como é gravado no banco: relativo a FILES_ROOT quando estiver dentro
+    dele (linhas menores, independe de onde o volume está montado); caminhos
+    fora de FILES_ROOT continuam absolutos.
+    """
+    p = Path(path)
+    try:
+        return str(p.relative_to(settings.FILES_ROOT))
+    except ValueError:
+        return str(p)
+
+
+def resolve_stored_path(value: Optional[str]) -> Optional[Path]:
+    """Inverso de to_stored_path; valores absolutos (legados) passam direto."""
+    if not value:
+        return None
+    return Path(settings.FILES_ROOT) / value
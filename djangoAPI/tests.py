@@ -0,0 +1,91 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from djangoAPI.cors import CorsMiddleware
+
+ALLOWED = "https://app.example.com"
+OTHER = "https://evil.example.com"
+
+
+@override_settings(
+    CORS_ALLOW_ALL_ORIGINS=False,
+    CORS_ALLOW_CREDENTIALS=False,
+    CORS_ALLOWED_ORIGINS=(ALLOWED,),
+)
+class CorsMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.calls = 0
+
+    def _middleware(self):
+        def get_response(request):
+            self.calls += 1
+            return HttpResponse("ok")
+        return CorsMiddleware(get_response)
+
+    def test_preflight_from_allowed_origin(self):
+        request = self.factory.options(
+            "/api/processes/", HTTP_ORIGIN=ALLOWED,
+            HTTP_ACCESS_CONTROL_REQUEST_METHOD="POST",
+        )
+        response = self._middleware()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, 0)  # não passa pelo resto do stack
+        self.assertEqual(response["Access-Control-Allow-Origin"], ALLOWED)
+        self.assertIn("POST", response["Access-Control-Allow-Methods"])
+        for header in ("authorization", "content-type", "dnt", "origin"):
+            self.assertIn(header, response["Access-Control-Allow-Headers"])
+        self.assertEqual(response["Access-Control-Max-Age"], "86400")
+        self.assertIn("origin", response["Vary"].lower())
+
+    def test_allowed_origin(self):
+        response = self._middleware()(self.factory.get("/api/processes/", HTTP_ORIGIN=ALLOWED))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(response["Access-Control-Allow-Origin"], ALLOWED)
+        self.assertIn("origin", response["Vary"].lower())
+        self.assertNotIn("Access-Control-Allow-Credentials", response)
+
+    def test_disallowed_origin_gets_vary_but_no_cors_headers(self):
+        response = self._middleware()(self.factory.get("/api/processes/", HTTP_ORIGIN=OTHER))
+        self.assertNotIn("Access-Control-Allow-Origin", response)
+        self.assertIn("origin", response["Vary"].lower())
+
+    def test_disallowed_preflight_gets_empty_200_without_cors_headers(self):
+        request = self.factory.options(
+            "/api/processes/", HTTP_ORIGIN=OTHER,
+            HTTP_ACCESS_CONTROL_REQUEST_METHOD="POST",
+        )
+        response = self._middleware()(request)
+        self.assertEqual(self.calls, 0)  # não chega na view (nem no 401 da auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertFalse(any(name.lower().startswith("access-control-") for name in response.headers))
+        self.assertIn("origin", response["Vary"].lower())
+
+    def test_plain_options_from_disallowed_origin_reaches_view(self):
+        response = self._middleware()(self.factory.options("/api/processes/", HTTP_ORIGIN=OTHER))
+        self.assertEqual(self.calls, 1)
+        self.assertNotIn("Access-Control-Allow-Origin", response)
+
+    def test_request_without_origin_is_untouched(self):
+        response = self._middleware()(self.factory.get("/api/processes/"))
+        self.assertNotIn("Access-Control-Allow-Origin", response)
+        self.assertFalse(response.has_header("Vary"))
+
+    @override_settings(CORS_ALLOW_CREDENTIALS=True)
+    def test_credentials_echo_origin(self):
+        response = self._middleware()(self.factory.get("/api/processes/", HTTP_ORIGIN=ALLOWED))
+        self.assertEqual(response["Access-Control-Allow-Origin"], ALLOWED)
+        self.assertEqual(response["Access-Control-Allow-Credentials"], "true")
+
+    @override_settings(CORS_ALLOW_ALL_ORIGINS=True)
+    def test_allow_all_without_credentials_uses_wildcard(self):
+        response = self._middleware()(self.factory.get("/api/processes/", HTTP_ORIGIN=OTHER))
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+
+    @override_settings(CORS_ALLOW_ALL_ORIGINS=True, CORS_ALLOW_CREDENTIALS=True)
+    def test_allow_all_with_credentials_echoes_origin(self):
+        response = self._middleware()(self.factory.get("/api/processes/", HTTP_ORIGIN=OTHER))
+        self.assertEqual(response["Access-Control-Allow-Origin"], OTHER)
+        self.assertEqual(response["Access-Control-Allow-Credentials"], "true")
+        self.assertIn("origin", response["Vary"].lower())
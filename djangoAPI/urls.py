@@ -1,7 +1,9 @@
 # djangoAPI/urls.py
 from django.contrib import admin
 from django.urls import path, include
+from django.views.decorators.cache import cache_page
 from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.views import TokenRefreshView
 
 from users.views_auth import AuthLoginPasswordView, AuthLoginProfileView
 from users.views_password import PasswordRecoveryView, PasswordUpdateView
@@ -16,9 +18,10 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path(
         "api/openapi.json",
-        SpectacularAPIView.as_view(
-            renderer_classes=[JSONRenderer],  
-        ),
+        # schema só muda com deploy: gera uma vez e serve do cache por 1h
+        cache_page(60 * 60)(SpectacularAPIView.as_view(
+            renderer_classes=[JSONRenderer],
+        )),
         name="schema",
     ),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
@@ -27,6 +30,7 @@ urlpatterns = [
      # Auth (JWT)
      path("api/auth/login/password", AuthLoginPasswordView.as_view(), name="auth-login-password"),
     path("api/auth/login/profile", AuthLoginProfileView.as_view(), name="auth-login-profile"),
+    path("api/auth/token/refresh", TokenRefreshView.as_view(), name="auth-token-refresh"),
     path("api/auth/password/recovery", PasswordRecoveryView.as_view(), name="auth-password-recovery"),
     path("api/auth/password/update", PasswordUpdateView.as_view(), name="auth-password-update"),
 
@@ -3,6 +3,12 @@ from django.contrib import admin
 from .models import MacromoleculeType, Macromolecule
 
 
+def _is_changelist(model_admin, request) -> bool:
+    opts = model_admin.model._meta
+    match = getattr(request, "resolver_match", None)
+    return bool(match) and match.url_name == f"{opts.app_label}_{opts.model_name}_changelist"
+
+
 @admin.register(MacromoleculeType)
 class MacromoleculeTypeAdmin(admin.ModelAdmin):
     list_display = ("name", "active", "created_at", "updated_at")
@@ -11,6 +17,13 @@ class MacromoleculeTypeAdmin(admin.ModelAdmin):
     ordering = ("name",)
     readonly_fields = ("created_at", "updated_at")
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        # na listagem, busca só as colunas exibidas (o form de edição segue completo)
+        if _is_changelist(self, request):
+            qs = qs.only("id", "name", "active", "created_at", "updated_at")
+        return qs
+
 
 @admin.register(Macromolecule)
 class MacromoleculeAdmin(admin.ModelAdmin):
@@ -20,6 +33,7 @@ class MacromoleculeAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = ["type"]
+    list_select_related = ("type",)
     search_fields = ("nome", "rec", "ligante_original")
     ordering = ("-created_at",)
     autocomplete_fields = ("type",)
@@ -41,3 +55,12 @@ class MacromoleculeAdmin(admin.ModelAdmin):
             "fields": ("created_at", "updated_at"),
         }),
     )
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if _is_changelist(self, request):
+            qs = qs.only(
+                "id", "nome", "type__id", "type__name",
+                "rmsd_redocking", "energia_original", "created_at",
+            )
+        return qs
@@ -1,6 +1,23 @@
+import os
+from pathlib import Path
+
 from django.apps import AppConfig
 
 
 class MacromoleculesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'macromolecules'
+
+    def ready(self):
+        # Conecta a invalidação do cache de tipos (signals)
+        from . import cache  # noqa: F401
+
+        # Garante a pasta base uma vez por processo (e não a cada upload)
+        from django.conf import settings
+
+        base_dir = Path(settings.MOLECULES_BASE_DIR)
+        base_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            os.chmod(base_dir, 0o2775)
+        except PermissionError:
+            pass
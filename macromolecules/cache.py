@@ -0,0 +1,47 @@
+# macromolecules/cache.py
+import uuid
+from typing import Dict, Optional
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from djangoAPI.auth_cache import user_cache_enabled
+from .models import MacromoleculeType
+
+TYPES_CACHE_KEY = "macromolecule_types:by_id"
+TYPES_CACHE_TTL = 60 * 60
+
+
+def get_types_by_id() -> Dict[str, MacromoleculeType]:
+    """{str(id): MacromoleculeType} em cache (tipos mudam raramente)."""
+    return cache.get_or_set(
+        TYPES_CACHE_KEY,
+        lambda: {str(t.id): t for t in MacromoleculeType.objects.all()},
+        TYPES_CACHE_TTL,
+    )
+
+
+def get_cached_type(pk) -> Optional[MacromoleculeType]:
+    """Tipo pelo cache, ou None (o chamador consulta o banco)."""
+    # mesmo critério do cache de User: sem backend compartilhado, a invalidação
+    # não alcançaria os outros workers e um tipo removido seria aceito
+    if not user_cache_enabled():
+        return None
+    try:
+        key = str(uuid.UUID(str(pk)))
+    except (TypeError, ValueError, AttributeError):
+        return None
+    return get_types_by_id().get(key)
+
+
+def invalidate_types(**kwargs) -> None:
+    # só saves/deletes por instância disparam signals: queryset.update() em
+    # MacromoleculeType não invalida (o dict vale até TYPES_CACHE_TTL)
+    if user_cache_enabled():
+        cache.delete(TYPES_CACHE_KEY)
+
+
+post_save.connect(invalidate_types, sender=MacromoleculeType,
+                  dispatch_uid="macromolecule_types_cache_post_save")
+post_delete.connect(invalidate_types, sender=MacromoleculeType,
+                    dispatch_uid="macromolecule_types_cache_post_delete")
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.4 on 2026-10-15 12:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('macromolecules', '0003_remove_macromolecule_redocking_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='macromolecule',
+            index=models.Index(fields=['-created_at'], name='macro_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='macromolecule',
+            index=models.Index(fields=['nome'], name='macro_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='macromolecule',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nome'), name='gin_trgm_ops'), name='macro_nome_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='macromolecule',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('rec'), name='gin_trgm_ops'), name='macro_rec_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='macromolecule',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('ligante_original'), name='gin_trgm_ops'), name='macro_lig_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 4.2.4 on 2026-10-15 12:10
+
+import logging
+import math
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+logger = logging.getLogger(__name__)
+
+
+def _triplet(value, cast):
+    """"x y z" / "x,y,z" -> [x, y, z]; None se vazio ou não interpretável."""
+    if not value:
+        return None
+    parts = str(value).replace(",", " ").split()
+    if len(parts) != 3:
+        return None
+    try:
+        numbers = [float(p) for p in parts]
+        if not all(math.isfinite(n) for n in numbers):
+            return None
+        values = [cast(n) for n in numbers]
+    except (ValueError, OverflowError):
+        return None
+    if cast is int and any(v <= 0 for v in values):
+        return None  # gridsize é PositiveIntegerField
+    return values
+
+
+def _number(value):
+    """Texto -> float (aceita vírgula decimal); None se vazio ou não interpretável."""
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        number = float(str(value).strip().replace(",", "."))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def forwards(apps, schema_editor):
+    Macromolecule = apps.get_model("macromolecules", "Macromolecule")
+    batch = []
+    for m in Macromolecule.objects.only(
+        "id", "gridsize", "gridcenter", "rmsd_redocking", "energia_original"
+    ).iterator(chunk_size=500):
+        m.gridsize_typed = _triplet(m.gridsize, int)
+        m.gridcenter_typed = _triplet(m.gridcenter, float)
+        m.rmsd_redocking_typed = _number(m.rmsd_redocking)
+        m.energia_original_typed = _number(m.energia_original)
+        # valores legados que não deu para converter viram NULL, sem abortar o migrate
+        for name in ("gridsize", "gridcenter", "rmsd_redocking", "energia_original"):
+            legacy = getattr(m, name)
+            if legacy not in (None, "") and str(legacy).strip() and getattr(m, f"{name}_typed") is None:
+                logger.warning("Macromolecule %s: %s=%r não interpretável, gravado como NULL",
+                               m.pk, name, legacy)
+        batch.append(m)
+    Macromolecule.objects.bulk_update(
+        batch,
+        ["gridsize_typed", "gridcenter_typed", "rmsd_redocking_typed", "energia_original_typed"],
+        batch_size=500,
+    )
+
+
+def backwards(apps, schema_editor):
+    Macromolecule = apps.get_model("macromolecules", "Macromolecule")
+    batch = []
+    for m in Macromolecule.objects.iterator(chunk_size=500):
+        m.gridsize = " ".join(str(v) for v in m.gridsize_typed) if m.gridsize_typed else None
+        m.gridcenter = " ".join(str(v) for v in m.gridcenter_typed) if m.gridcenter_typed else None
+        m.rmsd_redocking = f"{m.rmsd_redocking_typed:.3f}" if m.rmsd_redocking_typed is not None else None
+        m.energia_original = f"{m.energia_original_typed:.2f}" if m.energia_original_typed is not None else None
+        batch.append(m)
+    Macromolecule.objects.bulk_update(
+        batch, ["gridsize", "gridcenter", "rmsd_redocking", "energia_original"], batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('macromolecules', '0004_macromolecule_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='macromolecule',
+            name='gridsize_typed',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), blank=True, null=True, size=3),
+        ),
+        migrations.AddField(
+            model_name='macromolecule',
+            name='gridcenter_typed',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, null=True, size=3),
+        ),
+        migrations.AddField(
+            model_name='macromolecule',
+            name='rmsd_redocking_typed',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='macromolecule',
+            name='energia_original_typed',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(model_name='macromolecule', name='gridsize'),
+        migrations.RemoveField(model_name='macromolecule', name='gridcenter'),
+        migrations.RemoveField(model_name='macromolecule', name='rmsd_redocking'),
+        migrations.RemoveField(model_name='macromolecule', name='energia_original'),
+        migrations.RenameField(model_name='macromolecule', old_name='gridsize_typed', new_name='gridsize'),
+        migrations.RenameField(model_name='macromolecule', old_name='gridcenter_typed', new_name='gridcenter'),
+        migrations.RenameField(model_name='macromolecule', old_name='rmsd_redocking_typed', new_name='rmsd_redocking'),
+        migrations.RenameField(model_name='macromolecule', old_name='energia_original_typed', new_name='energia_original'),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.4 on 2026-10-15 12:20
+
+from django.db import migrations, models
+import macromolecules.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('macromolecules', '0005_macromolecule_typed_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='macromoleculetype',
+            name='id',
+            field=models.UUIDField(default=macromolecules.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='macromolecule',
+            name='id',
+            field=models.UUIDField(default=macromolecules.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
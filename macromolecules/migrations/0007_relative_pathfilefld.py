@@ -0,0 +1,39 @@
+# Generated by Django 4.2.4 on 2026-10-15 14:10
+
+from pathlib import Path
+
+from django.conf import settings
+from django.db import migrations
+
+
+def _to_relative(apps, schema_editor):
+    Macromolecule = apps.get_model('macromolecules', 'Macromolecule')
+    root = Path(settings.FILES_ROOT)
+    for macro in Macromolecule.objects.exclude(pathFilefld__isnull=True).only('id', 'pathFilefld').iterator():
+        value = Path(macro.pathFilefld)
+        if not value.is_absolute():
+            continue
+        try:
+            rel = str(value.relative_to(root))
+        except ValueError:
+            continue
+        Macromolecule.objects.filter(pk=macro.pk).update(pathFilefld=rel)
+
+
+def _to_absolute(apps, schema_editor):
+    Macromolecule = apps.get_model('macromolecules', 'Macromolecule')
+    root = Path(settings.FILES_ROOT)
+    for macro in Macromolecule.objects.exclude(pathFilefld__isnull=True).only('id', 'pathFilefld').iterator():
+        if macro.pathFilefld and not Path(macro.pathFilefld).is_absolute():
+            Macromolecule.objects.filter(pk=macro.pk).update(pathFilefld=str(root / macro.pathFilefld))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('macromolecules', '0006_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(_to_relative, _to_absolute),
+    ]
@@ -1,5 +1,23 @@
+import os
+import time
 import uuid
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
+
+from djangoAPI.paths import resolve_stored_path
+
+
+def uuid7() -> uuid.UUID:
+    """
+    UUIDv7 (RFC 9562): 48 bits de timestamp em ms + aleatório.
+    Ordenado no tempo → novas linhas caem no fim do índice da PK (sem páginas aleatórias).
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)   # versão 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)   # variante RFC 4122
+    return uuid.UUID(int=value)
 
 
 class MacromoleculeType(models.Model):
@@ -7,7 +25,7 @@ class MacromoleculeType(models.Model):
     class Meta:
         db_table = "macromolecule_types"
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=255, unique=True)   # ex.: 'falciparum'
     description = models.TextField(null=True, blank=True)
     redocking = models.BooleanField(default=True)          # ← MOVIDO PARA CÁ
@@ -23,8 +41,18 @@ class MacromoleculeType(models.Model):
 class Macromolecule(models.Model):
     class Meta:
         db_table = "macromolecules"
+        # type_id já é indexado pela própria FK.
+        # icontains no Postgres vira UPPER(col) LIKE '%...%': os índices trigram
+        # são sobre UPPER(col) para que a busca do admin/API use index scan.
+        indexes = [
+            models.Index(fields=["-created_at"], name="macro_created_at_idx"),
+            models.Index(fields=["nome"], name="macro_nome_idx"),
+            GinIndex(OpClass(Upper("nome"), name="gin_trgm_ops"), name="macro_nome_trgm_idx"),
+            GinIndex(OpClass(Upper("rec"), name="gin_trgm_ops"), name="macro_rec_trgm_idx"),
+            GinIndex(OpClass(Upper("ligante_original"), name="gin_trgm_ops"), name="macro_lig_trgm_idx"),
+        ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     nome = models.CharField(max_length=255)
     rec = models.CharField(max_length=255)
 
@@ -38,15 +66,20 @@ class Macromolecule(models.Model):
     )
 
     # redocking REMOVIDO DAQUI
-    gridsize = models.CharField(max_length=255, null=True, blank=True)
-    gridcenter = models.CharField(max_length=255, null=True, blank=True)
+    gridsize = ArrayField(models.PositiveIntegerField(), size=3, null=True, blank=True)   # [x, y, z] pontos
+    gridcenter = ArrayField(models.FloatField(), size=3, null=True, blank=True)          # [x, y, z] Å
     ligante_original = models.CharField(max_length=255, null=True, blank=True)
-    rmsd_redocking = models.CharField(max_length=255, null=True, blank=True)
-    energia_original = models.CharField(max_length=255, null=True, blank=True)
-    pathFilefld = models.CharField(max_length=1024, null=True, blank=True)
+    rmsd_redocking = models.FloatField(null=True, blank=True)
+    energia_original = models.FloatField(null=True, blank=True)
+    pathFilefld = models.CharField(max_length=1024, null=True, blank=True)  # relativo a FILES_ROOT
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.nome
+
+    @property
+    def fld_path(self):
+        """pathFilefld resolvido (absoluto)."""
+        return resolve_stored_path(self.pathFilefld)
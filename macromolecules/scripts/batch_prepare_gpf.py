@@ -0,0 +1,42 @@
+# macromolecules/scripts/batch_prepare_gpf.py
+"""
+Executa várias chamadas do prepare_gpf4.py num único interpretador pythonsh.
+
+Roda dentro do Python do MGLTools (2.x), por isso nada de sintaxe py3-only.
+Entrada (stdin, JSON):
+    {"script": "<caminho do prepare_gpf4.py>",
+     "jobs": [["-r", "rec.pdbqt", "-o", "grid_1.gpf", "-p", "..."], ...]}
+
+O script é executado como __main__ para cada job com o sys.argv do job;
+os módulos do AutoDockTools ficam em sys.modules após o primeiro, então
+o custo de startup/import é pago uma vez só.
+"""
+import json
+import sys
+
+
+def main():
+    spec = json.load(sys.stdin)
+    script = spec["script"]
+    code = compile(open(script).read(), script, "exec")
+
+    failed = 0
+    for argv in spec["jobs"]:
+        sys.argv = [script] + [str(a) for a in argv]
+        try:
+            exec(code, {"__name__": "__main__", "__file__": script})
+        except SystemExit:
+            e = sys.exc_info()[1]
+            if e.code not in (None, 0):
+                failed += 1
+                sys.stderr.write("job %r exited with %r\n" % (argv, e.code))
+        except Exception:
+            e = sys.exc_info()[1]
+            failed += 1
+            sys.stderr.write("job %r failed: %s\n" % (argv, e))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
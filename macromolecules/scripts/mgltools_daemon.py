@@ -0,0 +1,77 @@
+# macromolecules/scripts/mgltools_daemon.py
+"""
+Interpretador pythonsh de longa duração para os scripts do AutoDockTools.
+
+Roda dentro do Python do MGLTools (2.x), por isso nada de sintaxe py3-only.
+Protocolo (uma linha JSON por comando, uma linha JSON por resposta):
+    -> {"script": "<prepare_*4.py>", "argv": ["-r", "rec.pdb", ...], "cwd": "<workdir>"}
+    -> {"script": "<prepare_*4.py>", "jobs": [[...argv...], ...], "cwd": "<workdir>"}
+    <- {"ok": true} | {"ok": false, "error": "..."}
+A forma com "jobs" roda vários argv do mesmo script numa única ida e volta.
+
+Cada script é compilado uma vez e executado como __main__ com o sys.argv do
+comando; os módulos do AutoDockTools ficam em sys.modules, então o custo de
+startup/import é pago só na primeira chamada. A saída dos scripts vai para
+stderr: o stdout original fica reservado para as respostas do protocolo.
+"""
+import json
+import os
+import sys
+
+
+def run_job(code, script, argv):
+    """Executa o script como __main__ com argv; retorna a mensagem de erro ou None."""
+    sys.argv = [script] + [str(a) for a in argv]
+    try:
+        exec(code, {"__name__": "__main__", "__file__": script})
+    except SystemExit:
+        e = sys.exc_info()[1]
+        if e.code not in (None, 0):
+            return "%r exited with %r" % (argv, e.code)
+    except Exception:
+        e = sys.exc_info()[1]
+        return "%r failed: %s: %s" % (argv, e.__class__.__name__, e)
+    return None
+
+
+def main():
+    # stdout do protocolo num fd próprio; prints dos scripts vão para stderr
+    proto = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    compiled = {}
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            cmd = json.loads(line)
+            script = cmd["script"]
+            code = compiled.get(script)
+            if code is None:
+                code = compile(open(script).read(), script, "exec")
+                compiled[script] = code
+
+            os.chdir(cmd["cwd"])
+            jobs = cmd["jobs"] if "jobs" in cmd else [cmd["argv"]]
+            errors = [err for err in [run_job(code, script, argv) for argv in jobs] if err]
+            if errors:
+                reply = {"ok": False, "error": "; ".join(errors)}
+            else:
+                reply = {"ok": True}
+        except Exception:
+            e = sys.exc_info()[1]
+            reply = {"ok": False, "error": "%s: %s" % (e.__class__.__name__, e)}
+
+        sys.stderr.flush()
+        proto.write(json.dumps(reply) + "\n")
+        proto.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,73 @@
 import logging
+import math
 import os
-from pathlib import Path
+from functools import lru_cache
 from django.conf import settings
+from django.db import transaction
 from django.utils.text import slugify
 from rest_framework import serializers
 
 from macromolecules.tasks import prepare_macromolecule
+from macromolecules.util import save_upload
+from djangoAPI.paths import to_stored_path
+from .cache import get_cached_type
 from .models import MacromoleculeType, Macromolecule
 
 
+@lru_cache(maxsize=256)
+def _slug(value: str) -> str:
+    """slugify memoizado: nomes de tipos/receptores se repetem entre uploads."""
+    return slugify(value, allow_unicode=False)
+
+
+class CachedTypePKField(serializers.PrimaryKeyRelatedField):
+    """PK de MacromoleculeType resolvida pelo cache de tipos; cai no banco se não achar."""
+
+    def to_internal_value(self, data):
+        obj = get_cached_type(data)
+        if obj is not None:
+            return obj
+        return super().to_internal_value(data)
+
+
+class TripletField(serializers.Field):
+    """
+    Vetor de 3 números (gridsize/gridcenter).
+    Aceita "x y z", "x,y,z" ou lista; representa como lista.
+    """
+    default_error_messages = {
+        "invalid": "Informe exatamente 3 valores numéricos (ex.: \"60 60 60\").",
+    }
+
+    def __init__(self, cast=float, **kwargs):
+        self.cast = cast
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            parts = data.replace(",", " ").split()
+        elif isinstance(data, (list, tuple)):
+            parts = list(data)
+        else:
+            self.fail("invalid")
+        if len(parts) != 3:
+            self.fail("invalid")
+        try:
+            numbers = [float(p) for p in parts]
+        except (TypeError, ValueError, OverflowError):
+            self.fail("invalid")
+        # nan/inf nunca são válidos; para int (pontos do grid), só inteiros
+        # positivos, como na migração 0005 — nada de truncar 60.5 -> 60
+        if not all(math.isfinite(n) for n in numbers):
+            self.fail("invalid")
+        if self.cast is int and any(n != int(n) or n <= 0 for n in numbers):
+            self.fail("invalid")
+        return [self.cast(n) for n in numbers]
+
+    def to_representation(self, value):
+        return list(value)
+
+
 class MacromoleculeTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = MacromoleculeType
@@ -33,6 +92,8 @@ class MacromoleculeReadTypeSerializer(serializers.ModelSerializer):
 class MacromoleculeSerializer(serializers.ModelSerializer):
     # leitura completa
     type_detail = MacromoleculeReadTypeSerializer(source="type", read_only=True)
+    gridsize = TripletField(cast=int, required=False, allow_null=True)
+    gridcenter = TripletField(required=False, allow_null=True)
 
     class Meta:
         model = Macromolecule
@@ -60,7 +121,9 @@ class MacromoleculeCreateSerializer(serializers.ModelSerializer):
     Serializer usado apenas no POST com upload.
     `redocking` agora vem de MacromoleculeType.redocking.
     """
-    type = serializers.PrimaryKeyRelatedField(queryset=MacromoleculeType.objects.all())
+    type = CachedTypePKField(queryset=MacromoleculeType.objects.all())
+    gridsize = TripletField(cast=int, required=False, allow_null=True)
+    gridcenter = TripletField(required=False, allow_null=True)
     recptorFile = serializers.FileField(write_only=True)
     ligandFile = serializers.FileField(write_only=True)
 
@@ -81,27 +144,22 @@ class MacromoleculeCreateSerializer(serializers.ModelSerializer):
         mtype: MacromoleculeType = validated_data["type"]
 
         # nomes “seguros” para diretórios
-        type_name = slugify(mtype.name, allow_unicode=False) or "tipo"
+        type_name = _slug(mtype.name) or "tipo"
         redocking_str = "true" if mtype.redocking else "false"
 
         # Nomes originais (com extensão) e "stem" para salvar no DB
-        rec_name  = Path(rec_file.name).name           # ex.: "1cjb_a.pdb"
-        rec_stem  = Path(rec_name).stem                # ex.: "1cjb_a"   ← salvar no DB
-        lig_name  = Path(lig_file.name).name           # ex.: "POP.pdb"
-        lig_stem  = Path(lig_name).stem                # ex.: "POP"      ← salvar no DB
+        # (só operações de string aqui; Path fica para o disco)
+        rec_name  = os.path.basename(rec_file.name)    # ex.: "1cjb_a.pdb"
+        rec_stem  = os.path.splitext(rec_name)[0]      # ex.: "1cjb_a"   ← salvar no DB
+        lig_name  = os.path.basename(lig_file.name)    # ex.: "POP.pdb"
+        lig_stem  = os.path.splitext(lig_name)[0]      # ex.: "POP"      ← salvar no DB
 
         # Diretório baseado no stem do receptor (sem extensão)
-        rec_dirname = slugify(rec_stem, allow_unicode=False) or "receptor"
+        rec_dirname = _slug(rec_stem) or "receptor"
 
         # destino: <BASE>/molecules/<type.name>/<redocking>/<rec_stem>
-        base_dir: Path = settings.MOLECULES_BASE_DIR
-        base_dir.mkdir(parents=True, exist_ok=True)
-        try:
-            os.chmod(base_dir, 0o2775)
-        except PermissionError:
-            pass
-
-        dest_dir = base_dir / type_name / redocking_str / rec_dirname
+        # (a pasta base é criada em MacromoleculesConfig.ready)
+        dest_dir = settings.MOLECULES_BASE_DIR / type_name / redocking_str / rec_dirname
         try:
             dest_dir.mkdir(parents=True, exist_ok=True)
             os.chmod(dest_dir, 0o2775)
@@ -115,31 +173,34 @@ class MacromoleculeCreateSerializer(serializers.ModelSerializer):
         rec_path = dest_dir / rec_name
         lig_path = dest_dir / lig_name
 
-        with rec_path.open("wb") as f:
-            for chunk in rec_file.chunks():
-                f.write(chunk)
-        with lig_path.open("wb") as f:
-            for chunk in lig_file.chunks():
-                f.write(chunk)
+        save_upload(rec_file, rec_path)
+        save_upload(lig_file, lig_path)
 
         # === Preenche campos do modelo (SEM extensão no banco) ===
         validated_data["rec"] = rec_stem
         validated_data["ligante_original"] = lig_stem
-        validated_data["pathFilefld"] = str(dest_dir)
+        validated_data["pathFilefld"] = to_stored_path(dest_dir)
 
         instance = Macromolecule.objects.create(**validated_data)
 
-        # === Enfileira a task passando os NOMES COM EXTENSÃO ===
-        try:
-            prepare_macromolecule.delay(
-                str(dest_dir),
-                rec_name,                              # com extensão
-                validated_data.get("gridsize"),
-                validated_data.get("gridcenter"),
-                lig_name if mtype.redocking else None, # com extensão (se redocking)
-                str(instance.id),
-            )
-        except Exception:
-            logging.getLogger(__name__).exception("Falha ao enfileirar task prepare_macromolecule")
+        # === Enfileira a task (após o commit) passando os NOMES COM EXTENSÃO ===
+        gridsize = validated_data.get("gridsize")
+        gridcenter = validated_data.get("gridcenter")
+        task_args = (
+            str(dest_dir),
+            rec_name,                              # com extensão
+            " ".join(map(str, gridsize)) if gridsize else None,
+            " ".join(map(str, gridcenter)) if gridcenter else None,
+            lig_name if mtype.redocking else None, # com extensão (se redocking)
+            str(instance.id),
+        )
+
+        def _enqueue():
+            try:
+                prepare_macromolecule.apply_async(args=task_args, ignore_result=True)
+            except Exception:
+                logging.getLogger(__name__).exception("Falha ao enfileirar task prepare_macromolecule")
+
+        transaction.on_commit(_enqueue)
 
         return instance
\ No newline at end of file
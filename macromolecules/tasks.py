@@ -2,20 +2,33 @@
 Módulo de processamento assíncrono de macromoléculas para docking molecular.
 Utiliza Celery para execução de tarefas de preparação de receptores e ligantes.
 """
+import asyncio
+import hashlib
+import io
+import itertools
+import json
+import logging
 import os
+import select
 import shlex
+import shutil
 import subprocess
+import tempfile
+import threading
 import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Tuple, List, Optional, Dict, Any
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
+import numpy as np
 from celery import shared_task
+from celery.signals import worker_process_init, worker_process_shutdown
 from celery.utils.log import get_task_logger
 from django.db import transaction
 
+from djangoAPI.cpus import available_cpus
+from djangoAPI.paths import to_stored_path
 from macromolecules.util import textfld
 from macromolecules.models import Macromolecule
 
@@ -35,7 +48,12 @@ class ToolPaths:
     fld_cutoff_line: int
     
     def __post_init__(self):
-        """Valida existência das ferramentas na inicialização."""
+        """
+        Valida existência das ferramentas na inicialização
+        (DOCKING_SKIP_TOOL_VALIDATION=1 pula os stats, ex.: imagens read-only já validadas).
+        """
+        if os.getenv("DOCKING_SKIP_TOOL_VALIDATION") == "1":
+            return
         missing = []
         for field_name, value in self.__dict__.items():
             if field_name != 'fld_cutoff_line' and isinstance(value, Path):
@@ -45,6 +63,35 @@ class ToolPaths:
         if missing:
             raise RuntimeError(f"Ferramentas ausentes: {', '.join(missing)}")
     
+    # Prefixos de argv congelados por operação (montados uma vez por processo)
+    @cached_property
+    def prepare_receptor_argv(self) -> Tuple[str, str]:
+        return (str(self.pythonsh), str(self.prepare_receptor))
+    
+    @cached_property
+    def prepare_ligand_argv(self) -> Tuple[str, str]:
+        return (str(self.pythonsh), str(self.prepare_ligand))
+    
+    @cached_property
+    def prepare_gpf_argv(self) -> Tuple[str, str]:
+        return (str(self.pythonsh), str(self.prepare_gpf))
+    
+    @cached_property
+    def batch_prepare_gpf_argv(self) -> Tuple[str, str]:
+        return (str(self.pythonsh), str(BATCH_PREPARE_GPF_SCRIPT))
+    
+    @cached_property
+    def mgltools_daemon_argv(self) -> Tuple[str, str]:
+        return (str(self.pythonsh), str(MGLTOOLS_DAEMON_SCRIPT))
+    
+    @cached_property
+    def autogrid4_argv(self) -> Tuple[str]:
+        return (str(self.autogrid4),)
+    
+    @cached_property
+    def autodock_gpu_argv(self) -> Tuple[str]:
+        return (str(self.autodock_gpu),)
+    
     @classmethod
     @lru_cache(maxsize=1)
     def get_instance(cls) -> 'ToolPaths':
@@ -67,6 +114,26 @@ class ToolPaths:
             fld_cutoff_line=int(os.getenv("FLD_APPEND_CUTOFF_LINE", "23"))
         )
 
+# Driver que roda todos os prepare_gpf4 num único pythonsh
+BATCH_PREPARE_GPF_SCRIPT = Path(__file__).resolve().parent / "scripts" / "batch_prepare_gpf.py"
+
+# pythonsh persistente para prepare_receptor4/prepare_ligand4/prepare_gpf4
+MGLTOOLS_DAEMON_SCRIPT = Path(__file__).resolve().parent / "scripts" / "mgltools_daemon.py"
+MGLTOOLS_DAEMON_ENABLED = os.getenv("MGLTOOLS_DAEMON", "1") == "1"
+
+# Grava docking_result.xml com o XML capturado do stdout do AutoDock-GPU
+PERSIST_DOCKING_XML = os.getenv("DOCKING_PERSIST_XML", "1") == "1"
+
+# Scratch local (ex.: /dev/shm) para a I/O intermediária; vazio = tudo direto no workdir
+DOCKING_SCRATCH_DIR = os.getenv("DOCKING_SCRATCH_DIR", "")
+# O que volta do scratch para o workdir: PDBQTs, mapas/FLD (usados pelos processos
+# de docking via pathFilefld) e saídas do AutoDock-GPU. GPF/GLG ficam para trás.
+PERSISTED_SUFFIXES = frozenset({".pdbqt", ".map", ".fld", ".xyz", ".xml", ".dlg"})
+
+# Cache em disco de PDBQT já convertidos (vazio desativa)
+_pdbqt_cache_env = os.getenv("PDBQT_CACHE_DIR", "/var/cache/docking/pdbqt")
+PDBQT_CACHE_DIR: Optional[Path] = Path(_pdbqt_cache_env) if _pdbqt_cache_env else None
+
 # ====== Constantes otimizadas ======
 LIGAND_GROUPS: Tuple[str, ...] = (
     "C,A,N,NA,NS,OA,OS,SA,S,H,HD",
@@ -82,6 +149,36 @@ LIGAND_GROUPS: Tuple[str, ...] = (
     "Pa,U,Np,Pu,Am,Cm,Bk,Cf,E,Fm",
 )
 
+# Argumentos "-p ligand_types=..." já montados, um por grupo (grid_1 ... grid_11)
+LIGAND_TYPE_ARGS: Tuple[str, ...] = tuple(f"ligand_types={g}" for g in LIGAND_GROUPS)
+GPF_NAMES: Tuple[str, ...] = tuple(f"grid_{i}.gpf" for i in range(1, len(LIGAND_GROUPS) + 1))
+
+
+@lru_cache(maxsize=64)
+def _gpf_jobs(receptor_pdbqt_name: str, center: Tuple[float, float, float],
+              size: Tuple[int, int, int]) -> Tuple[Tuple[str, ...], ...]:
+    """argv dos 11 prepare_gpf4 para (receptor, centro, tamanho), montados uma vez."""
+    center_arg = "gridcenter=" + ",".join(str(c) for c in center)
+    npts_arg = "npts=" + ",".join(str(n) for n in size)
+    return tuple(
+        ("-r", receptor_pdbqt_name, "-o", gpf_name,
+         "-p", center_arg, "-p", npts_arg, "-p", ligand_types_arg)
+        for gpf_name, ligand_types_arg in zip(GPF_NAMES, LIGAND_TYPE_ARGS)
+    )
+
+@lru_cache(maxsize=1)
+def _fld_template_parts() -> List[bytes]:
+    """
+    Template do FLD (util.textfld) já codificado e partido no placeholder
+    "kakakakaka", montado uma vez por processo: por receptor resta só um join.
+    """
+    return textfld().encode("utf-8").split(b"kakakakaka")
+
+
+def _pool_size(n_jobs: int) -> int:
+    """Pool fixo: nunca mais workers que jobs ou CPUs disponíveis."""
+    return max(1, min(n_jobs, available_cpus()))
+
 # ====== Classes para melhor organização ======
 @dataclass
 class GridParams:
@@ -100,6 +197,7 @@ class GridParams:
         return None
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def _parse_triplet_int(s: str) -> Tuple[int, int, int]:
         """Converte string para tripla de inteiros."""
         parts = [p for p in s.replace(",", " ").split() if p]
@@ -108,6 +206,7 @@ class GridParams:
         return tuple(map(int, parts))
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def _parse_triplet_float(s: str) -> Tuple[float, float, float]:
         """Converte string para tripla de floats."""
         parts = [p for p in s.replace(",", " ").split() if p]
@@ -127,22 +226,25 @@ class ProcessExecutor:
     """Gerencia execução de processos externos com melhor tratamento de erros."""
     
     @staticmethod
-    def run(cmd: List[str], workdir: Path, tag: str, timeout: int = 300) -> None:
-        """Executa comando com timeout e logging melhorado."""
-        cmd_str = " ".join(shlex.quote(c) for c in cmd)
-        logger.info("[%s] Executing: %s (cwd=%s)", tag, cmd_str, workdir)
+    def run(cmd: List[str], workdir: Path, tag: str, timeout: int = 300,
+            input: Optional[str] = None) -> None:
+        """Executa comando com timeout e logging melhorado (input opcional via stdin)."""
+        if logger.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(shlex.quote(c) for c in cmd)
+            logger.info("[%s] Executing: %s (cwd=%s)", tag, cmd_str, workdir)
         
         try:
             proc = subprocess.run(
                 cmd, 
                 cwd=str(workdir), 
+                input=input,
                 text=True, 
                 capture_output=True,
                 timeout=timeout,
                 check=True
             )
             
-            if proc.stdout:
+            if proc.stdout and logger.isEnabledFor(logging.DEBUG):
                 logger.debug("[%s] stdout: %s", tag, proc.stdout.strip())
             if proc.stderr and proc.stderr.strip():
                 logger.warning("[%s] stderr: %s", tag, proc.stderr.strip())
@@ -155,28 +257,245 @@ class ProcessExecutor:
             raise RuntimeError(f"{tag} failed (rc={e.returncode})")
     
     @staticmethod
-    def run_capture(cmd: List[str], workdir: Path, tag: str, timeout: int = 300) -> str:
-        """Executa comando e captura stdout."""
-        cmd_str = " ".join(shlex.quote(c) for c in cmd)
-        logger.info("[%s] Executing: %s", tag, cmd_str)
+    async def run_async(cmd: List[str], workdir: Path, tag: str, timeout: int = 300,
+                        input: Optional[str] = None) -> str:
+        """
+        Versão asyncio de run(): os pipes são lidos pelo event loop, então vários
+        comandos independentes podem rodar juntos via asyncio.gather.
+        """
+        if logger.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(shlex.quote(c) for c in cmd)
+            logger.info("[%s] Executing: %s (cwd=%s)", tag, cmd_str, workdir)
         
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(workdir),
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
         try:
-            proc = subprocess.run(
+            stdout_b, stderr_b = await asyncio.wait_for(
+                proc.communicate(input.encode() if input is not None else None), timeout
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logger.error("[%s] Timeout after %ds", tag, timeout)
+            raise RuntimeError(f"{tag} timeout after {timeout}s")
+        except asyncio.CancelledError:
+            # outra etapa do gather falhou: não deixa o subprocesso órfão
+            proc.kill()
+            await proc.wait()
+            raise
+        
+        stdout = stdout_b.decode("utf-8", errors="replace")
+        stderr = stderr_b.decode("utf-8", errors="replace")
+        if proc.returncode != 0:
+            logger.error("[%s] Failed with rc=%d: %s", tag, proc.returncode, stderr)
+            raise RuntimeError(f"{tag} failed (rc={proc.returncode})")
+        
+        if stdout and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[%s] stdout: %s", tag, stdout.strip())
+        if stderr.strip():
+            logger.warning("[%s] stderr: %s", tag, stderr.strip())
+        return stdout
+    
+    @staticmethod
+    def run_capture(cmd: List[str], workdir: Path, tag: str, timeout: int = 300,
+                    start_marker: Optional[bytes] = None,
+                    end_marker: Optional[bytes] = None) -> bytes:
+        """
+        Executa comando e captura stdout (bytes, sem decode) em streaming.
+        Com start_marker/end_marker, guarda só o trecho entre os marcadores
+        (inclusive) e descarta o resto sem acumular, ex.: o XML do AutoDock-GPU
+        no meio do log.
+        """
+        if logger.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(shlex.quote(c) for c in cmd)
+            logger.info("[%s] Executing: %s", tag, cmd_str)
+        
+        with tempfile.TemporaryFile() as stderr_f:
+            proc = subprocess.Popen(
                 cmd,
                 cwd=str(workdir),
+                stdout=subprocess.PIPE,
+                stderr=stderr_f,
+            )
+            timed_out = threading.Event()
+            
+            def _kill_on_timeout():
+                timed_out.set()
+                proc.kill()
+            
+            timer = threading.Timer(timeout, _kill_on_timeout)
+            timer.start()
+            
+            buf: List[bytes] = []
+            capturing = start_marker is None
+            done = False
+            try:
+                for line in proc.stdout:
+                    if done:
+                        continue  # só drena o pipe
+                    if not capturing:
+                        pos = line.find(start_marker)
+                        if pos == -1:
+                            continue
+                        capturing = True
+                        line = line[pos:]
+                    buf.append(line)
+                    if end_marker is not None and end_marker in line:
+                        done = True
+                proc.wait()
+            finally:
+                timer.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+            
+            if timed_out.is_set():
+                logger.error("[%s] Timeout after %ds", tag, timeout)
+                raise RuntimeError(f"{tag} timeout after {timeout}s")
+            if proc.returncode != 0:
+                stderr_f.seek(0)
+                stderr = stderr_f.read().decode("utf-8", errors="replace")
+                logger.error("[%s] Failed with rc=%d: %s", tag, proc.returncode, stderr.strip())
+                raise RuntimeError(f"{tag} failed (rc={proc.returncode})")
+        
+        return b"".join(buf)
+
+class MGLToolsDaemon:
+    """
+    Cliente do pythonsh persistente (scripts/mgltools_daemon.py), um por processo
+    worker. Os comandos vão por pipe (JSON por linha) em vez de fork+exec de um
+    pythonsh novo; o daemon é serial, então as chamadas passam por um lock.
+    Se o daemon morrer ou estourar o timeout, é morto e recriado na próxima chamada.
+    """
+    _instance: Optional['MGLToolsDaemon'] = None
+    _instance_lock = threading.Lock()
+    
+    def __init__(self, argv: Tuple[str, ...]):
+        self.argv = argv
+        self.proc: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def get(cls) -> Optional['MGLToolsDaemon']:
+        """Instância do processo atual (None se MGLTOOLS_DAEMON=0)."""
+        if not MGLTOOLS_DAEMON_ENABLED:
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(ToolPaths.get_instance().mgltools_daemon_argv)
+            return cls._instance
+    
+    def start(self) -> None:
+        with self.lock:
+            self._ensure_running()
+    
+    def stop(self) -> None:
+        with self.lock:
+            if self.proc is not None and self.proc.poll() is None:
+                try:
+                    self.proc.stdin.close()
+                    self.proc.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    self._kill()
+            self.proc = None
+    
+    def _ensure_running(self) -> subprocess.Popen:
+        if self.proc is None or self.proc.poll() is not None:
+            self.proc = subprocess.Popen(
+                self.argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
                 text=True,
-                capture_output=True,
-                timeout=timeout,
-                check=True
+                bufsize=1,
             )
-            return proc.stdout or ""
+            logger.info("Started MGLTools daemon (pid=%d)", self.proc.pid)
+        return self.proc
+    
+    def _kill(self) -> None:
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+    
+    def call(self, script: str, argv: List[str], workdir: Path, tag: str,
+             timeout: int = 300) -> None:
+        """Executa script (como __main__) com argv no diretório workdir."""
+        if logger.isEnabledFor(logging.INFO):
+            cmd_str = " ".join(shlex.quote(c) for c in [script, *argv])
+            logger.info("[%s] Executing via daemon: %s (cwd=%s)", tag, cmd_str, workdir)
+        self._request({"script": script, "argv": argv, "cwd": str(workdir)}, tag, timeout)
+    
+    def call_batch(self, script: str, jobs: List[List[str]], workdir: Path, tag: str,
+                   timeout: int = 300) -> None:
+        """Executa script uma vez por argv de jobs, numa única ida e volta ao daemon."""
+        logger.info("[%s] Executing %d jobs via daemon: %s (cwd=%s)", tag, len(jobs), script, workdir)
+        self._request({"script": script, "jobs": jobs, "cwd": str(workdir)}, tag, timeout)
+    
+    def _request(self, payload: Dict[str, Any], tag: str, timeout: int) -> None:
+        with self.lock:
+            proc = self._ensure_running()
+            try:
+                proc.stdin.write(json.dumps(payload) + "\n")
+                proc.stdin.flush()
+                ready, _, _ = select.select([proc.stdout], [], [], timeout)
+                line = proc.stdout.readline() if ready else None
+            except OSError as e:
+                self._kill()
+                raise RuntimeError(f"{tag} failed (daemon: {e})")
             
-        except subprocess.TimeoutExpired:
-            logger.error("[%s] Timeout after %ds", tag, timeout)
-            raise RuntimeError(f"{tag} timeout after {timeout}s")
-        except subprocess.CalledProcessError as e:
-            logger.error("[%s] Failed with rc=%d", tag, e.returncode)
-            raise RuntimeError(f"{tag} failed (rc={e.returncode})")
+            if line is None:
+                self._kill()
+                logger.error("[%s] Timeout after %ds", tag, timeout)
+                raise RuntimeError(f"{tag} timeout after {timeout}s")
+            if not line:
+                self._kill()
+                raise RuntimeError(f"{tag} failed (daemon exited)")
+        
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            logger.error("[%s] Failed: %s", tag, reply.get("error"))
+            raise RuntimeError(f"{tag} failed ({reply.get('error')})")
+    
+    async def call_async(self, script: str, argv: List[str], workdir: Path, tag: str,
+                         timeout: int = 300) -> None:
+        await asyncio.to_thread(self.call, script, argv, workdir, tag, timeout)
+    
+    async def call_batch_async(self, script: str, jobs: List[List[str]], workdir: Path, tag: str,
+                               timeout: int = 300) -> None:
+        await asyncio.to_thread(self.call_batch, script, jobs, workdir, tag, timeout)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """
+    Inicialização única por processo worker: valida os caminhos das ferramentas
+    (ToolPaths fica em cache) e sobe o pythonsh persistente, tirando esse custo
+    da primeira task.
+    """
+    try:
+        ToolPaths.get_instance()
+    except RuntimeError as e:
+        logger.warning("Tool validation failed at worker init: %s", e)
+        return
+    try:
+        daemon = MGLToolsDaemon.get()
+        if daemon:
+            daemon.start()
+    except Exception as e:
+        logger.warning("MGLTools daemon not started: %s", e)
+
+
+@worker_process_shutdown.connect
+def _stop_mgltools_daemon(**kwargs):
+    if MGLToolsDaemon._instance is not None:
+        MGLToolsDaemon._instance.stop()
+
 
 class MoleculeProcessor:
     """Processa preparação de moléculas."""
@@ -185,8 +504,19 @@ class MoleculeProcessor:
         self.workdir = workdir
         self.tools = tools
         self.executor = ProcessExecutor()
+        self.daemon = MGLToolsDaemon.get()
     
-    def prepare_receptor(self, receptor_pdb: Path) -> Path:
+    async def _run_mgltools(self, script_argv: Tuple[str, str], argv: List[str], tag: str) -> None:
+        """
+        Roda um script do AutoDockTools (script_argv = (pythonsh, script)) no daemon,
+        ou num pythonsh novo se desativado.
+        """
+        if self.daemon:
+            await self.daemon.call_async(script_argv[1], argv, self.workdir, tag)
+        else:
+            await self.executor.run_async([*script_argv, *argv], self.workdir, tag)
+    
+    async def prepare_receptor_async(self, receptor_pdb: Path) -> Path:
         """Prepara receptor convertendo PDB para PDBQT."""
         if not receptor_pdb.exists():
             raise FileNotFoundError(f"Receptor PDB not found: {receptor_pdb}")
@@ -194,19 +524,25 @@ class MoleculeProcessor:
         receptor_name = receptor_pdb.stem
         receptor_pdbqt = self.workdir / f"{receptor_name}.pdbqt"
         
-        self.executor.run(
-            [str(self.tools.pythonsh), str(self.tools.prepare_receptor),
-             "-r", receptor_pdb.name, "-o", receptor_pdbqt.name],
-            self.workdir,
+        cached = self._pdbqt_cache_path(receptor_pdb, self.tools.prepare_receptor)
+        if cached and cached.exists():
+            shutil.copyfile(cached, receptor_pdbqt)
+            logger.info("Receptor PDBQT from cache: %s", cached.name)
+            return receptor_pdbqt
+        
+        await self._run_mgltools(
+            self.tools.prepare_receptor_argv,
+            ["-r", receptor_pdb.name, "-o", receptor_pdbqt.name],
             f"prepare_receptor_{receptor_name}"
         )
         
         if not receptor_pdbqt.exists():
             raise RuntimeError(f"Failed to generate receptor PDBQT: {receptor_pdbqt}")
         
+        self._store_pdbqt_cache(receptor_pdbqt, cached)
         return receptor_pdbqt
     
-    def prepare_ligand(self, ligand_pdb: Path) -> Optional[Path]:
+    async def prepare_ligand_async(self, ligand_pdb: Path) -> Optional[Path]:
         """Prepara ligante convertendo PDB para PDBQT."""
         if not ligand_pdb or not ligand_pdb.exists():
             return None
@@ -214,98 +550,184 @@ class MoleculeProcessor:
         ligand_name = ligand_pdb.stem
         ligand_pdbqt = self.workdir / f"{ligand_name}.pdbqt"
         
-        self.executor.run(
-            [str(self.tools.pythonsh), str(self.tools.prepare_ligand),
-             "-l", ligand_pdb.name, "-o", ligand_pdbqt.name],
-            self.workdir,
+        cached = self._pdbqt_cache_path(ligand_pdb, self.tools.prepare_ligand)
+        if cached and cached.exists():
+            shutil.copyfile(cached, ligand_pdbqt)
+            logger.info("Ligand PDBQT from cache: %s", cached.name)
+            return ligand_pdbqt
+        
+        await self._run_mgltools(
+            self.tools.prepare_ligand_argv,
+            ["-l", ligand_pdb.name, "-o", ligand_pdbqt.name],
             f"prepare_ligand_{ligand_name}"
         )
         
         if not ligand_pdbqt.exists():
             raise RuntimeError(f"Failed to generate ligand PDBQT: {ligand_pdbqt}")
         
+        self._store_pdbqt_cache(ligand_pdbqt, cached)
         return ligand_pdbqt
     
+    @staticmethod
+    def _pdbqt_cache_path(source: Path, tool: Path) -> Optional[Path]:
+        """
+        Caminho no cache de PDBQT para (nome + conteúdo do PDB, versão do script).
+        Retorna None se o cache estiver desativado (PDBQT_CACHE_DIR vazio).
+        """
+        if not PDBQT_CACHE_DIR:
+            return None
+        h = hashlib.blake2b(digest_size=16)
+        h.update(source.name.encode())
+        h.update(source.read_bytes())
+        try:
+            h.update(str(tool.stat().st_mtime_ns).encode())
+        except OSError:
+            pass
+        return PDBQT_CACHE_DIR / f"{h.hexdigest()}.pdbqt"
+    
+    @staticmethod
+    def _store_pdbqt_cache(pdbqt: Path, cached: Optional[Path]) -> None:
+        """Guarda o PDBQT gerado no cache (falhas de escrita não afetam a task)."""
+        if cached is None:
+            return
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+            shutil.copyfile(pdbqt, tmp)
+            os.replace(tmp, cached)  # atômico: outro worker nunca lê arquivo pela metade
+        except OSError as e:
+            logger.warning("Could not store PDBQT cache %s: %s", cached, e)
+    
     def calculate_ligand_center(self, ligand_path: Path) -> Optional[Tuple[float, float, float]]:
-        """Calcula centro geométrico do ligante com processamento otimizado."""
+        """Calcula centro geométrico do ligante (colunas fixas do PDB, vetorizado com NumPy)."""
         if not ligand_path.exists():
             return None
         
         try:
-            coords = []
-            with ligand_path.open("r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    if line.startswith(("ATOM", "HETATM")) and len(line) >= 54:
-                        try:
-                            x = float(line[30:38].strip())
-                            y = float(line[38:46].strip())
-                            z = float(line[46:54].strip())
-                            coords.append((x, y, z))
-                        except ValueError:
-                            continue
+            # x/y/z ficam nas colunas fixas 30:38, 38:46, 46:54 → registros de 3×8 bytes.
+            # Leitura binária linha a linha (sem decode nem cópia do arquivo inteiro).
+            with ligand_path.open("rb", buffering=io.DEFAULT_BUFFER_SIZE) as f:
+                records = [
+                    line[30:54]
+                    for line in f
+                    if line.startswith((b"ATOM", b"HETATM")) and len(line.rstrip(b"\r\n")) >= 54
+                ]
+            if not records:
+                logger.warning("No valid coordinates found in %s", ligand_path.name)
+                return None
             
-            if coords:
-                n = len(coords)
-                center = tuple(sum(coord[i] for coord in coords) / n for i in range(3))
-                logger.info("Calculated center from %s: (%.2f, %.2f, %.2f)", 
-                           ligand_path.name, *center)
-                return center
+            try:
+                coords = np.frombuffer(b"".join(records), dtype="S8").astype(np.float64).reshape(-1, 3)
+            except ValueError:
+                # alguma coluna não numérica: descarta só as linhas inválidas
+                rows = []
+                for rec in records:
+                    try:
+                        rows.append((float(rec[0:8]), float(rec[8:16]), float(rec[16:24])))
+                    except ValueError:
+                        continue
+                if not rows:
+                    logger.warning("No valid coordinates found in %s", ligand_path.name)
+                    return None
+                coords = np.array(rows, dtype=np.float64)
             
-            logger.warning("No valid coordinates found in %s", ligand_path.name)
-            return None
+            center = tuple(float(c) for c in coords.mean(axis=0))
+            logger.info("Calculated center from %s: (%.2f, %.2f, %.2f)", 
+                       ligand_path.name, *center)
+            return center
             
         except Exception as e:
             logger.exception("Error calculating center from %s: %s", ligand_path, e)
             return None
     
-    def prepare_gpf_files(self, receptor_pdbqt: Path, grid_params: GridParams) -> List[Path]:
-        """Prepara arquivos GPF em paralelo para melhor performance."""
-        gpf_files = []
-        
-        def prepare_single_gpf(index: int, ligand_types: str) -> Path:
-            gpf_name = f"grid_{index}.gpf"
-            
-            self.executor.run(
-                [str(self.tools.pythonsh), str(self.tools.prepare_gpf),
-                 "-r", receptor_pdbqt.name, "-o", gpf_name,
-                 "-p", f"gridcenter={grid_params.center[0]},{grid_params.center[1]},{grid_params.center[2]}",
-                 "-p", f"npts={grid_params.size[0]},{grid_params.size[1]},{grid_params.size[2]}",
-                 "-p", f"ligand_types={ligand_types}"],
+    async def prepare_gpf_files_async(self, receptor_pdbqt: Path, grid_params: GridParams) -> List[Path]:
+        """
+        Prepara os 11 GPFs no daemon do MGLTools ou, se desativado, num único
+        processo pythonsh (scripts/batch_prepare_gpf.py): o startup do MGLTools
+        é pago no máximo uma vez.
+        """
+        jobs = _gpf_jobs(receptor_pdbqt.name, grid_params.center, grid_params.size)
+        if self.daemon:
+            await self.daemon.call_batch_async(
+                self.tools.prepare_gpf_argv[1], jobs, self.workdir, "prepare_gpf_batch"
+            )
+        else:
+            await self.executor.run_async(
+                list(self.tools.batch_prepare_gpf_argv),
                 self.workdir,
-                f"prepare_gpf_{index}"
+                "prepare_gpf_batch",
+                input=json.dumps({"script": self.tools.prepare_gpf_argv[1], "jobs": jobs}),
             )
-            
+        
+        gpf_files = []
+        for gpf_name in GPF_NAMES:
             gpf_path = self.workdir / gpf_name
             if not gpf_path.exists():
                 raise RuntimeError(f"Failed to generate {gpf_name}")
             
             # Adiciona parameter_file
             self._prepend_parameter_file(gpf_path)
-            return gpf_path
-        
-        # Processa GPFs sequencialmente (pode ser paralelizado se necessário)
-        for i, ligand_types in enumerate(LIGAND_GROUPS, start=1):
-            gpf_files.append(prepare_single_gpf(i, ligand_types))
+            gpf_files.append(gpf_path)
         
         return gpf_files
     
     def _prepend_parameter_file(self, gpf_path: Path) -> None:
-        """Adiciona linha de parameter_file ao início do GPF."""
-        content = gpf_path.read_text(encoding="utf-8")
-        new_content = f"parameter_file {self.tools.ad4_parameters}\n{content}"
-        gpf_path.write_text(new_content, encoding="utf-8")
+        """
+        Adiciona linha de parameter_file ao início do GPF.
+        Escreve o cabeçalho num .tmp, copia o GPF original em blocos e troca
+        atomicamente (os.replace), sem carregar o arquivo inteiro na memória.
+        """
+        tmp_path = gpf_path.with_suffix(".gpf.tmp")
+        with tmp_path.open("w", encoding="utf-8") as out:
+            out.write(f"parameter_file {self.tools.ad4_parameters}\n")
+            with gpf_path.open("r", encoding="utf-8") as src:
+                shutil.copyfileobj(src, out, 64 * 1024)
+        os.replace(tmp_path, gpf_path)
         logger.debug("Added parameter_file to %s", gpf_path.name)
     
-    def run_autogrid(self, gpf_files: List[Path]) -> Path:
-        """Executa autogrid4 para todos os GPFs."""
-        for i, gpf in enumerate(gpf_files, start=1):
-            self.executor.run(
-                [str(self.tools.autogrid4), "-p", gpf.name, "-l", f"grid_{i}.glg"],
-                self.workdir,
-                f"autogrid_{i}"
-            )
+    async def run_autogrid_async(self, gpf_files: List[Path], receptor_pdbqt: Path) -> Path:
+        """
+        Executa autogrid4 para todos os GPFs (em paralelo, limitado ao nº de CPUs).
+        Toda execução grava os mesmos <receptor>.maps.fld/.maps.xyz e mapas e/d,
+        com cabeçalho diferente por GPF: cada uma roda no seu subdiretório e as
+        saídas voltam ao workdir na ordem dos GPFs, como na execução serial
+        (o último GPF define o FLD).
+        """
+        limit = asyncio.Semaphore(_pool_size(len(gpf_files)))
+        run_dirs = [self.workdir / f"autogrid_{i}" for i in range(1, len(gpf_files) + 1)]
         
-        # Encontra arquivo FLD gerado
+        async def run_single_autogrid(index: int, gpf: Path, run_dir: Path) -> None:
+            run_dir.mkdir(exist_ok=True)
+            for src in (gpf, receptor_pdbqt):
+                link = run_dir / src.name
+                if not link.exists():
+                    os.symlink(os.path.join("..", src.name), link)
+            async with limit:
+                await self.executor.run_async(
+                    [*self.tools.autogrid4_argv, "-p", gpf.name, "-l", f"grid_{index}.glg"],
+                    run_dir,
+                    f"autogrid_{index}"
+                )
+        
+        try:
+            await asyncio.gather(*(
+                run_single_autogrid(i, gpf, run_dir)
+                for i, (gpf, run_dir) in enumerate(zip(gpf_files, run_dirs), start=1)
+            ))
+            for run_dir in run_dirs:
+                with os.scandir(run_dir) as it:
+                    for entry in it:
+                        if entry.is_file(follow_symlinks=False):
+                            os.replace(entry.path, self.workdir / entry.name)
+        finally:
+            for run_dir in run_dirs:
+                shutil.rmtree(run_dir, ignore_errors=True)
+        
+        # Encontra arquivo FLD gerado: nome esperado (gridfld do prepare_gpf4)
+        # direto, varrendo o diretório só se não estiver lá
+        expected = self.workdir / f"{receptor_pdbqt.stem}.maps.fld"
+        if expected.exists():
+            return expected
         fld_candidates = list(self.workdir.glob("*.maps.fld"))
         if not fld_candidates:
             raise RuntimeError("No *.maps.fld file generated by autogrid4")
@@ -318,16 +740,14 @@ class MoleculeProcessor:
             logger.error("FLD file not found: %s", fld_path)
             return
         
-        # Lê arquivo e mantém apenas linhas necessárias
-        with fld_path.open("r", encoding="utf-8") as f:
-            lines = f.readlines()
-        
-        keep_lines = lines[:self.tools.fld_cutoff_line] if len(lines) >= self.tools.fld_cutoff_line else lines
+        # Lê só as primeiras linhas necessárias (bytes, sem decode); o restante nem é carregado
+        with fld_path.open("rb") as f:
+            keep_lines = list(itertools.islice(f, self.tools.fld_cutoff_line))
         
         # Adiciona template
-        template = textfld().replace("kakakakaka", receptor_name)
+        template = receptor_name.encode().join(_fld_template_parts())
         
-        with fld_path.open("w", encoding="utf-8") as f:
+        with fld_path.open("wb") as f:
             f.writelines(keep_lines)
             f.write(template)
         
@@ -341,31 +761,32 @@ class MoleculeProcessor:
         
         try:
             stdout = self.executor.run_capture(
-                [str(self.tools.autodock_gpu), "--ffile", fld_path.name, 
+                [*self.tools.autodock_gpu_argv, "--ffile", fld_path.name, 
                  "--lfile", ligand_pdbqt.name],
                 self.workdir,
                 f"autodock_gpu_{ligand_pdbqt.stem}",
-                timeout=600  # 10 minutos para docking
+                timeout=600,  # 10 minutos para docking
+                start_marker=b"<?xml",
+                end_marker=b"</autodock_gpu>",
             )
             
             # Extrai XML do output
             xml_text = self._extract_xml_from_text(stdout)
+            from_stdout = bool(xml_text)
             
             # Se não encontrou no stdout, procura arquivo XML
+            xml_path = None
             if not xml_text:
-                xml_files = sorted(self.workdir.glob("*.xml"))
-                if xml_files:
-                    xml_text = xml_files[-1].read_text(encoding="utf-8")
-                    xml_path = xml_files[-1]
-                else:
-                    xml_path = None
-            else:
-                # Salva XML extraído
-                xml_path = self.workdir / "docking_result.xml"
-                xml_path.write_text(xml_text, encoding="utf-8")
+                # AutoDock-GPU nomeia a saída pelo --lfile (<ligante>.xml)
+                xml_path = self.workdir / f"{ligand_pdbqt.stem}.xml"
+                if not xml_path.exists():
+                    xml_files = sorted(self.workdir.glob("*.xml"))
+                    xml_path = xml_files[-1] if xml_files else None
+                if xml_path:
+                    xml_text = xml_path.read_bytes()
             
-            # Parse resultados
-            result = DockingResult(xml_path=xml_path, success=True)
+            # Parse direto dos bytes em memória (o XML declara o próprio encoding)
+            result = DockingResult(success=True)
             
             if xml_text:
                 best = self._parse_best_from_xml(xml_text)
@@ -374,6 +795,12 @@ class MoleculeProcessor:
                     logger.info("Docking result: RMSD=%.3f, Energy=%.2f kcal/mol",
                                result.best_rmsd, result.best_energy)
             
+            # Salva XML extraído do stdout só se a cópia em disco for desejada
+            if from_stdout and PERSIST_DOCKING_XML:
+                xml_path = self.workdir / "docking_result.xml"
+                xml_path.write_bytes(xml_text)
+            result.xml_path = xml_path
+            
             return result
             
         except Exception as e:
@@ -381,49 +808,130 @@ class MoleculeProcessor:
             return DockingResult()
     
     @staticmethod
-    def _extract_xml_from_text(text: str) -> Optional[str]:
-        """Extrai conteúdo XML do texto."""
-        start = text.find("<?xml")
-        end_tag = "</autodock_gpu>"
-        end = text.rfind(end_tag)
+    def _extract_xml_from_text(data: bytes) -> Optional[bytes]:
+        """Extrai conteúdo XML da saída (bytes, sem decodificar o log ao redor)."""
+        start = data.find(b"<?xml")
+        end_tag = b"</autodock_gpu>"
+        end = data.rfind(end_tag)
         
         if start != -1 and end != -1:
-            return text[start:end + len(end_tag)]
+            return data[start:end + len(end_tag)]
         return None
     
     @staticmethod
-    def _parse_best_from_xml(xml_text: str) -> Optional[Tuple[float, float]]:
-        """Parse XML para extrair melhor resultado."""
+    def _parse_best_from_xml(xml_text: bytes) -> Optional[Tuple[float, float]]:
+        """
+        Parse XML para extrair melhor resultado.
+        Usa iterparse (streaming): cada <run> da rmsd_table é lido e descartado,
+        sem montar a árvore inteira na memória; o parse para ao fechar a rmsd_table.
+        Os atributos são acumulados como texto e convertidos/comparados de uma vez
+        no NumPy (parse de float e argmin em C).
+        """
+        rmsd_vals: List[str] = []
+        energy_vals: List[str] = []
+        in_rmsd_table = False
+        
         try:
-            root = ET.fromstring(xml_text)
-            runs = root.findall(".//result/rmsd_table/run")
+            for event, elem in ET.iterparse(io.BytesIO(xml_text), events=("start", "end")):
+                tag = elem.tag
+                if tag == "rmsd_table":
+                    if event == "end":
+                        break  # nada depois da tabela interessa
+                    in_rmsd_table = True
+                elif event == "end":
+                    # <run> também aparece em <runs>; só os da rmsd_table têm reference_rmsd
+                    if tag == "run" and in_rmsd_table:
+                        rmsd_vals.append(elem.get("reference_rmsd", "inf"))
+                        energy_vals.append(elem.get("binding_energy", "0"))
+                    elem.clear()
             
-            if not runs:
+            if not rmsd_vals:
                 return None
             
-            # Encontra melhor RMSD
-            best_rmsd = float('inf')
-            best_energy = None
-            
-            for run in runs:
-                rmsd = float(run.attrib.get("reference_rmsd", "inf"))
-                energy = float(run.attrib.get("binding_energy", "0"))
-                
-                if rmsd < best_rmsd:
-                    best_rmsd = rmsd
-                    best_energy = energy
-            
-            if best_rmsd < float('inf'):
-                return (best_rmsd, best_energy)
-            
-            return None
+            rmsd = np.array(rmsd_vals, dtype=np.float64)
+            i = int(rmsd.argmin())  # primeiro mínimo, como na comparação estrita
+            if not rmsd[i] < np.inf:
+                return None
+            return (float(rmsd[i]), float(energy_vals[i]))
             
         except (ET.ParseError, ValueError, KeyError) as e:
             logger.error("Failed to parse AutoDock-GPU XML: %s", e)
             return None
 
+def _make_scratch_dir() -> Optional[Path]:
+    """Cria o diretório temporário da task em DOCKING_SCRATCH_DIR (None se desativado)."""
+    if not DOCKING_SCRATCH_DIR:
+        return None
+    try:
+        Path(DOCKING_SCRATCH_DIR).mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(prefix="docking-", dir=DOCKING_SCRATCH_DIR))
+    except OSError as e:
+        logger.warning("Scratch dir unavailable (%s), using workdir: %s", DOCKING_SCRATCH_DIR, e)
+        return None
+
+
+def _persist_outputs(scratch: Path, wd: Path) -> None:
+    """Move do scratch para o workdir apenas os arquivos finais (PERSISTED_SUFFIXES)."""
+    moved = 0
+    for f in scratch.iterdir():
+        if f.suffix in PERSISTED_SUFFIXES and f.is_file():
+            shutil.move(str(f), str(wd / f.name))
+            moved += 1
+    logger.info("Moved %d output files from scratch %s to %s", moved, scratch, wd)
+
+
+async def _build_grid(
+    processor: MoleculeProcessor,
+    receptor_pdb: Path,
+    receptor_name: str,
+    grid_params: GridParams,
+    gpf_done: Optional[asyncio.Event] = None,
+) -> Tuple[Path, List[Path], Path]:
+    """
+    Receptor → GPFs → autogrid4 → FLD pós-processado (etapas dependentes).
+    gpf_done é sinalizado quando as etapas do MGLTools terminam (ou falham).
+    """
+    try:
+        receptor_pdbqt = await processor.prepare_receptor_async(receptor_pdb)
+        gpf_files = await processor.prepare_gpf_files_async(receptor_pdbqt, grid_params)
+    finally:
+        if gpf_done is not None:
+            gpf_done.set()
+    fld_path = await processor.run_autogrid_async(gpf_files, receptor_pdbqt)
+    processor.postprocess_fld(fld_path, receptor_name)
+    return receptor_pdbqt, gpf_files, fld_path
+
+
+async def _prepare_inputs(
+    processor: MoleculeProcessor,
+    receptor_pdb: Path,
+    receptor_name: str,
+    grid_params: GridParams,
+    ligand_pdb: Optional[Path],
+) -> Tuple[Path, List[Path], Path, Optional[Path]]:
+    """
+    Roda a cadeia do grid e a preparação do ligante (independente) ao mesmo tempo.
+    Com o daemon do MGLTools (serial), o ligante espera os GPFs para não atrasar
+    o caminho crítico e é preparado enquanto o autogrid4 roda.
+    """
+    if not ligand_pdb:
+        return (*await _build_grid(processor, receptor_pdb, receptor_name, grid_params), None)
+    
+    gpf_done = asyncio.Event() if processor.daemon else None
+    
+    async def ligand() -> Optional[Path]:
+        if gpf_done is not None:
+            await gpf_done.wait()
+        return await processor.prepare_ligand_async(ligand_pdb)
+    
+    (receptor_pdbqt, gpf_files, fld_path), ligand_pdbqt = await asyncio.gather(
+        _build_grid(processor, receptor_pdb, receptor_name, grid_params, gpf_done), ligand()
+    )
+    return receptor_pdbqt, gpf_files, fld_path, ligand_pdbqt
+
 # ====== Task Principal Otimizada ======
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+@shared_task(bind=True, max_retries=3, default_retry_delay=60, ignore_result=True,
+             acks_late=True, reject_on_worker_lost=True)
 def prepare_macromolecule(
     self,
     workdir: str,
@@ -464,43 +972,50 @@ def prepare_macromolecule(
         if ligand_filename:
             logger.info("Ligand: %s", ligand_filename)
         
-        # 1. Prepara receptor
-        receptor_pdbqt = processor.prepare_receptor(receptor_pdb)
-        
-        # 2. Determina parâmetros do grid
+        # 1. Determina parâmetros do grid (antes de qualquer subprocesso: falha cedo)
         grid_params = GridParams.from_strings(gridsize, gridcenter)
         
         # Se não tem centro definido, tenta calcular do ligante
-        if not grid_params and ligand_filename:
-            ligand_pdb = wd / ligand_filename
-            if ligand_pdb.exists():
-                center = processor.calculate_ligand_center(ligand_pdb)
-                if center and gridsize:
-                    size = GridParams._parse_triplet_int(gridsize)
-                    grid_params = GridParams(size=size, center=center)
+        ligand_pdb = wd / ligand_filename if ligand_filename else None
+        if not grid_params and ligand_pdb and ligand_pdb.exists():
+            center = processor.calculate_ligand_center(ligand_pdb)
+            if center and gridsize:
+                size = GridParams._parse_triplet_int(gridsize)
+                grid_params = GridParams(size=size, center=center)
         
         if not grid_params:
             raise ValueError("Grid parameters (size and center) are required")
         
-        # 3. Prepara arquivos GPF
-        gpf_files = processor.prepare_gpf_files(receptor_pdbqt, grid_params)
-        
-        # 4. Executa autogrid
-        fld_path = processor.run_autogrid(gpf_files)
-        
-        # 5. Pós-processa FLD
-        processor.postprocess_fld(fld_path, receptor_name)
-        
-        # 6. Prepara ligante (se fornecido)
-        ligand_pdbqt = None
-        if ligand_filename:
-            ligand_pdb = wd / ligand_filename
-            ligand_pdbqt = processor.prepare_ligand(ligand_pdb)
-        
-        # 7. Executa docking (se ligante disponível)
-        docking_result = DockingResult()
-        if ligand_pdbqt:
-            docking_result = processor.run_docking(fld_path, ligand_pdbqt)
+        # Com DOCKING_SCRATCH_DIR, toda a I/O intermediária roda no scratch
+        scratch = _make_scratch_dir()
+        try:
+            if scratch:
+                processor = MoleculeProcessor(scratch, tools)
+                if receptor_pdb.exists():
+                    shutil.copyfile(receptor_pdb, scratch / receptor_pdb.name)
+                receptor_pdb = scratch / receptor_pdb.name
+                if ligand_pdb and ligand_pdb.exists():
+                    shutil.copyfile(ligand_pdb, scratch / ligand_pdb.name)
+                    ligand_pdb = scratch / ligand_pdb.name
+            
+            # 2-6. Receptor → GPFs → autogrid → FLD, com o ligante preparado em paralelo
+            receptor_pdbqt, gpf_files, fld_path, ligand_pdbqt = asyncio.run(
+                _prepare_inputs(processor, receptor_pdb, receptor_name, grid_params, ligand_pdb)
+            )
+            
+            # 7. Executa docking (se ligante disponível)
+            docking_result = DockingResult()
+            if ligand_pdbqt:
+                docking_result = processor.run_docking(fld_path, ligand_pdbqt)
+            
+            if scratch:
+                _persist_outputs(scratch, wd)
+                fld_path = wd / fld_path.name
+                if docking_result.xml_path:
+                    docking_result.xml_path = wd / docking_result.xml_path.name
+        finally:
+            if scratch:
+                shutil.rmtree(scratch, ignore_errors=True)
         
         # 8. Atualiza banco de dados
         db_updated = False
@@ -550,39 +1065,33 @@ def _update_database(
     energy: Optional[float],
     fld_path: str
 ) -> bool:
-    """Atualiza dados da macromolécula no banco."""
+    """Atualiza dados da macromolécula no banco (um único UPDATE, sem SELECT FOR UPDATE)."""
+    # Atualiza apenas campos com novos valores
+    changes: Dict[str, Any] = {}
+    
+    if rmsd is not None:
+        changes["rmsd_redocking"] = round(rmsd, 3)
+    
+    if energy is not None:
+        changes["energia_original"] = round(energy, 2)
+    
+    if fld_path:
+        changes["pathFilefld"] = to_stored_path(fld_path)
+    
+    if not changes:
+        return False
+    
     try:
         with transaction.atomic():
-            obj = Macromolecule.objects.select_for_update().filter(
-                id=macromolecule_id
-            ).first()
-            
-            if not obj:
-                logger.warning("Macromolecule %s not found in database", macromolecule_id)
-                return False
-            
-            # Atualiza apenas campos com novos valores
-            update_fields = []
-            
-            if rmsd is not None:
-                obj.rmsd_redocking = f"{rmsd:.3f}"
-                update_fields.append("rmsd_redocking")
-            
-            if energy is not None:
-                obj.energia_original = f"{energy:.2f}"
-                update_fields.append("energia_original")
-            
-            if fld_path:
-                obj.pathFilefld = fld_path
-                update_fields.append("pathFilefld")
-            
-            if update_fields:
-                obj.save(update_fields=update_fields)
-                logger.info("Updated macromolecule %s: %s", 
-                           macromolecule_id, ", ".join(update_fields))
-                return True
-            
+            rows = Macromolecule.objects.filter(id=macromolecule_id).update(**changes)
+        
+        if not rows:
+            logger.warning("Macromolecule %s not found in database", macromolecule_id)
             return False
+        
+        logger.info("Updated macromolecule %s: %s",
+                   macromolecule_id, ", ".join(changes))
+        return True
             
     except Exception as e:
         logger.error("Failed to update database: %s", e, exc_info=True)
@@ -1,3 +1,149 @@
-from django.test import TestCase
+import importlib
+import shutil
+import tempfile
+import uuid
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.db.models.signals import post_delete, post_save
+from django.test import SimpleTestCase, override_settings
+from rest_framework import serializers
+
+from macromolecules import cache as types_cache
+from macromolecules.models import MacromoleculeType
+from macromolecules.serializers import CachedTypePKField, TripletField
+
+typed_columns = importlib.import_module("macromolecules.migrations.0005_macromolecule_typed_columns")
+
+
+class TypedColumnsMigrationTests(SimpleTestCase):
+    def test_triplet_parses_legacy_formats(self):
+        self.assertEqual(typed_columns._triplet("60 60 60", int), [60, 60, 60])
+        self.assertEqual(typed_columns._triplet("60,60,60", int), [60, 60, 60])
+        self.assertEqual(typed_columns._triplet(" 1.5, -2 3e1 ", float), [1.5, -2.0, 30.0])
+
+    def test_triplet_rejects_malformed_values(self):
+        for value in ("", None, "60 60", "60 60 60 60", "a b c", "inf 1 1", "nan 1 1", "1e999 1 1"):
+            with self.subTest(value=value):
+                self.assertIsNone(typed_columns._triplet(value, int))
+        self.assertIsNone(typed_columns._triplet("0 60 60", int))
+        self.assertIsNone(typed_columns._triplet("-1 60 60", int))
+
+    def test_number(self):
+        self.assertEqual(typed_columns._number("-8.1"), -8.1)
+        self.assertEqual(typed_columns._number("-7,5"), -7.5)
+        self.assertEqual(typed_columns._number(2), 2.0)
+        for value in (None, "", "  ", "abc", "nan", "inf", "1.2.3"):
+            with self.subTest(value=value):
+                self.assertIsNone(typed_columns._number(value))
+
+    def test_forwards_nulls_unparsable_rows(self):
+        rows = [
+            SimpleNamespace(pk=1, gridsize="60 60 60", gridcenter="1 2 3",
+                            rmsd_redocking="0.8", energia_original="-8.1"),
+            SimpleNamespace(pk=2, gridsize="sessenta", gridcenter="1 2",
+                            rmsd_redocking="n/a", energia_original=None),
+        ]
+        manager = mock.Mock()
+        manager.only.return_value.iterator.return_value = iter(rows)
+        apps = mock.Mock()
+        apps.get_model.return_value = SimpleNamespace(objects=manager)
+
+        with self.assertLogs(typed_columns.logger, level="WARNING") as logs:
+            typed_columns.forwards(apps, None)
+
+        good, bad = rows
+        self.assertEqual(good.gridsize_typed, [60, 60, 60])
+        self.assertEqual(good.gridcenter_typed, [1.0, 2.0, 3.0])
+        self.assertEqual(good.rmsd_redocking_typed, 0.8)
+        self.assertEqual(good.energia_original_typed, -8.1)
+        self.assertIsNone(bad.gridsize_typed)
+        self.assertIsNone(bad.gridcenter_typed)
+        self.assertIsNone(bad.rmsd_redocking_typed)
+        self.assertIsNone(bad.energia_original_typed)
+        self.assertEqual(len(logs.records), 3)  # energia_original vazio não é aviso
+        manager.bulk_update.assert_called_once()
+        self.assertEqual(manager.bulk_update.call_args.args[0], rows)
+
+
+class TripletFieldTests(SimpleTestCase):
+    def test_valid_values(self):
+        self.assertEqual(TripletField(cast=int).run_validation("60 60 60"), [60, 60, 60])
+        self.assertEqual(TripletField(cast=int).run_validation("60.0,60,60"), [60, 60, 60])
+        self.assertEqual(TripletField().run_validation(["1.5", -2, "3e1"]), [1.5, -2.0, 30.0])
+
+    def test_invalid_values(self):
+        cases = [
+            (int, "inf 60 60"),      # OverflowError em int(float("inf"))
+            (int, "nan 60 60"),
+            (int, "60.5 60 60"),     # não trunca
+            (int, "0 60 60"),        # pontos do grid são positivos
+            (int, "-60 60 60"),
+            (int, "1e999 60 60"),
+            (float, "nan inf 1"),
+            (float, "1 2"),
+            (float, "a b c"),
+            (float, [1, 2, None]),
+            (float, 123),
+        ]
+        for cast, value in cases:
+            with self.subTest(cast=cast, value=value):
+                with self.assertRaises(serializers.ValidationError):
+                    TripletField(cast=cast).run_validation(value)
+
+
+_CACHE_DIR = tempfile.mkdtemp(prefix="types-cache-tests-")
+
+
+# cache compartilhado entre processos (arquivo): o cache de tipos fica ativo
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": _CACHE_DIR,
+}})
+class TypesCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
+        self.mtype = MacromoleculeType(id=uuid.uuid4(), name="falciparum")
+        self.queryset = mock.Mock()
+        self.queryset.get.side_effect = MacromoleculeType.DoesNotExist
+        self.field = CachedTypePKField(queryset=self.queryset)
+
+    def _all(self):
+        return mock.patch.object(MacromoleculeType.objects, "all", return_value=[self.mtype])
+
+    def test_second_lookup_uses_the_cache(self):
+        with self._all() as all_:
+            first = self.field.to_internal_value(str(self.mtype.id))
+            second = self.field.to_internal_value(str(self.mtype.id))
+        self.assertEqual(all_.call_count, 1)
+        self.assertEqual(first.pk, self.mtype.pk)
+        self.assertEqual(second.name, "falciparum")
+        self.queryset.get.assert_not_called()
+
+    def test_save_and_delete_clear_the_cached_dict(self):
+        for signal, kwargs in ((post_save, {"created": False}), (post_delete, {})):
+            with self.subTest(signal=signal):
+                with self._all():
+                    types_cache.get_types_by_id()
+                self.assertIsNotNone(types_cache.cache.get(types_cache.TYPES_CACHE_KEY))
+                signal.send(sender=MacromoleculeType, instance=self.mtype, **kwargs)
+                self.assertIsNone(types_cache.cache.get(types_cache.TYPES_CACHE_KEY))
+
+    def test_unknown_or_invalid_pk_falls_back_to_the_queryset(self):
+        for pk in (str(uuid.uuid4()), "abc"):
+            with self.subTest(pk=pk):
+                with self._all():
+                    with self.assertRaises(serializers.ValidationError) as ctx:
+                        self.field.to_internal_value(pk)
+                self.assertEqual(ctx.exception.detail[0].code, "does_not_exist")
+                self.queryset.get.assert_called_with(pk=pk)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_local_cache_backend_always_reads_the_database(self):
+        self.queryset.get.side_effect = None
+        self.queryset.get.return_value = self.mtype
+        with self._all() as all_:
+            self.field.to_internal_value(str(self.mtype.id))
+            self.field.to_internal_value(str(self.mtype.id))
+        all_.assert_not_called()
+        self.assertEqual(self.queryset.get.call_count, 2)
@@ -1,3 +1,22 @@
+import shutil
+from pathlib import Path
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def save_upload(uploaded, dest_path: Path) -> None:
+    """
+    Grava um UploadedFile do Django em dest_path.
+    - TemporaryUploadedFile (já em disco): cópia no kernel via shutil.copyfile (sendfile).
+    - InMemoryUploadedFile: escreve em blocos de 1 MiB.
+    """
+    if hasattr(uploaded, "temporary_file_path"):
+        shutil.copyfile(uploaded.temporary_file_path(), dest_path)
+        return
+    with open(dest_path, "wb") as f:
+        for chunk in uploaded.chunks(chunk_size=UPLOAD_CHUNK_SIZE):
+            f.write(chunk)
+
 
 def textfld():
     return """
@@ -24,11 +24,17 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return request.user and request.user.is_staff
 
 
+_BOOL_MAP = {
+    **dict.fromkeys(("1", "true", "t", "yes", "y", "on"), True),
+    **dict.fromkeys(("0", "false", "f", "no", "n", "off"), False),
+}
+
+
 def _as_bool(val):
+    """true/false da query string; None se ausente ou não reconhecido (sem filtro)."""
     if val is None:
         return None
-    s = str(val).strip().lower()
-    return s in {"1", "true", "t", "yes", "y", "on"}
+    return _BOOL_MAP.get(str(val).strip().lower())
 
 
 @extend_schema(
@@ -63,16 +69,24 @@ class MacromoleculeTypeViewSet(viewsets.ModelViewSet):
     ordering_fields = ["name", "created_at", "updated_at"]
 
     def get_queryset(self):
-        qs = super().get_queryset()
         active = _as_bool(self.request.query_params.get("active"))
-        if active is not None:
-            qs = qs.filter(active=active)
-        return qs
+        if active is None:
+            return super().get_queryset()
+        return self.queryset.filter(active=active)
 
 
 @extend_schema(tags=["Macromolecules"])
 class MacromoleculeViewSet(viewsets.ModelViewSet):
-    queryset = Macromolecule.objects.select_related("type").all().order_by("-created_at")
+    # JOIN com o tipo (type_detail) e apenas as colunas que os serializers usam
+    queryset = (
+        Macromolecule.objects.select_related("type")
+        .only(
+            "id", "nome", "rec", "type__id", "type__name", "type__redocking",
+            "gridsize", "gridcenter", "ligante_original", "rmsd_redocking",
+            "energia_original", "pathFilefld", "created_at", "updated_at",
+        )
+        .order_by("-created_at")
+    )
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["nome", "rec", "ligante_original"]
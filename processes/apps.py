@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProcessesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'processes'
+
+    def ready(self):
+        # Conecta a invalidação do cache de status (signals)
+        from . import cache  # noqa: F401
@@ -0,0 +1,62 @@
+# processes/cache.py
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import Process
+
+STATUS_CACHE_TTL = 60 * 60 * 24
+
+# Só vale a pena com cache compartilhado entre web e worker (Redis): com
+# cache local por processo, a web nunca veria as mudanças feitas pelo worker.
+STATUS_CACHE_ENABLED = not any(
+    name in settings.CACHES["default"]["BACKEND"] for name in ("locmem", "dummy")
+)
+
+
+def _status_key(process_id) -> str:
+    return f"process:{process_id}:status"
+
+
+def set_cached_status(process_id, status: str, user_id) -> None:
+    """Publica o status atual do processo (chamado a cada transição)."""
+    if not STATUS_CACHE_ENABLED:
+        return
+    cache.set(
+        _status_key(process_id),
+        {"status": str(status), "user_id": user_id, "updated_at": timezone.now().isoformat()},
+        STATUS_CACHE_TTL,
+    )
+
+
+def get_cached_status(process_id) -> Optional[Dict]:
+    """{"status", "user_id", "updated_at"} do cache, ou None (cai para o banco)."""
+    if not STATUS_CACHE_ENABLED:
+        return None
+    return cache.get(_status_key(process_id))
+
+
+def _on_process_saved(sender, instance=None, update_fields=None, **kwargs) -> None:
+    # saves fora do worker (PATCH, admin) também mudam o status: o cache
+    # passa a refletir o valor gravado (após o commit) em vez de esperar o TTL
+    if not STATUS_CACHE_ENABLED or instance is None:
+        return
+    if update_fields is not None and "status" not in update_fields:
+        return
+    pk, status, user_id = instance.pk, instance.status, instance.user_id
+    transaction.on_commit(lambda: set_cached_status(pk, status, user_id))
+
+
+def _on_process_deleted(sender, instance=None, **kwargs) -> None:
+    if STATUS_CACHE_ENABLED and instance is not None:
+        cache.delete(_status_key(instance.pk))
+
+
+post_save.connect(_on_process_saved, sender=Process,
+                  dispatch_uid="process_status_cache_post_save")
+post_delete.connect(_on_process_deleted, sender=Process,
+                    dispatch_uid="process_status_cache_post_delete")
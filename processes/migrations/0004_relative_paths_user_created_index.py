@@ -0,0 +1,50 @@
+# Generated by Django 4.2.4 on 2026-10-15 14:10
+
+from pathlib import Path
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _to_relative(apps, schema_editor):
+    Process = apps.get_model('processes', 'Process')
+    root = Path(settings.FILES_ROOT)
+    for proc in Process.objects.only('id', 'pathFileSDF', 'pathFileZIP').iterator():
+        changes = {}
+        for field in ('pathFileSDF', 'pathFileZIP'):
+            value = getattr(proc, field)
+            if value and Path(value).is_absolute():
+                try:
+                    changes[field] = str(Path(value).relative_to(root))
+                except ValueError:
+                    pass
+        if changes:
+            Process.objects.filter(pk=proc.pk).update(**changes)
+
+
+def _to_absolute(apps, schema_editor):
+    Process = apps.get_model('processes', 'Process')
+    root = Path(settings.FILES_ROOT)
+    for proc in Process.objects.only('id', 'pathFileSDF', 'pathFileZIP').iterator():
+        changes = {}
+        for field in ('pathFileSDF', 'pathFileZIP'):
+            value = getattr(proc, field)
+            if value and not Path(value).is_absolute():
+                changes[field] = str(root / value)
+        if changes:
+            Process.objects.filter(pk=proc.pk).update(**changes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0003_process_pathfilezip'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='process',
+            index=models.Index(fields=['user', '-created_at'], name='proc_user_created'),
+        ),
+        migrations.RunPython(_to_relative, _to_absolute),
+    ]
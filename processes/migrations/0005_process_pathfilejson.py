@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-15 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0004_relative_paths_user_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='pathFileJSON',
+            field=models.CharField(blank=True, max_length=1024, null=True),
+        ),
+    ]
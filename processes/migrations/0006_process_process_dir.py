@@ -0,0 +1,27 @@
+# Generated by Django 4.2.4 on 2026-10-15 15:40
+
+from pathlib import PurePath
+
+from django.db import migrations, models
+
+
+def _backfill_process_dir(apps, schema_editor):
+    Process = apps.get_model('processes', 'Process')
+    for proc in Process.objects.exclude(pathFileSDF__isnull=True).exclude(pathFileSDF='').only('id', 'pathFileSDF').iterator():
+        Process.objects.filter(pk=proc.pk).update(process_dir=str(PurePath(proc.pathFileSDF).parent))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0005_process_pathfilejson'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='process_dir',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=1024),
+        ),
+        migrations.RunPython(_backfill_process_dir, migrations.RunPython.noop),
+    ]
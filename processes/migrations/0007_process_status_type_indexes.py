@@ -0,0 +1,24 @@
+# Generated by Django 4.2.4 on 2026-10-15 16:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('processes', '0006_process_process_dir'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='process',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='proc_user_status_created'),
+        ),
+        AddIndexConcurrently(
+            model_name='process',
+            index=models.Index(fields=['type', '-created_at'], name='proc_type_created'),
+        ),
+    ]
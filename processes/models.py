@@ -1,7 +1,10 @@
+import os
 import uuid
+from pathlib import Path, PurePath
 from django.db import models
 from users.models import User
 from macromolecules.models import MacromoleculeType
+from djangoAPI.paths import resolve_stored_path
 
 
 class ProcessStatusEnum(models.TextChoices):
@@ -14,6 +17,13 @@ class ProcessStatusEnum(models.TextChoices):
 class Process(models.Model):
     class Meta:
         db_table = "processes"
+        # listagem padrão: processos do usuário, mais recentes primeiro
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="proc_user_created"),
+            # filtros da listagem: ?status= (por usuário) e ?type_id=, mesma ordenação
+            models.Index(fields=["user", "status", "-created_at"], name="proc_user_status_created"),
+            models.Index(fields=["type", "-created_at"], name="proc_type_created"),
+        ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     nome = models.CharField(max_length=255)
@@ -32,10 +42,15 @@ class Process(models.Model):
     )
 
     resultado_final = models.JSONField(null=True, blank=True)  # JSONB
+    # caminhos relativos a FILES_ROOT (ver djangoAPI.paths)
     pathFileSDF = models.CharField(max_length=1024, null=True, blank=True)
+    # pasta do SDF (derivada em save()); indexada para achar processos na mesma pasta
+    process_dir = models.CharField(max_length=1024, blank=True, default="", db_index=True)
 
-    # ⬇⬇⬇ NOVO: caminho absoluto do .zip gerado
+    # ⬇⬇⬇ NOVO: caminho do .zip gerado
     pathFileZIP = models.CharField(max_length=1024, null=True, blank=True)
+    # resultado.json completo no disco
+    pathFileJSON = models.CharField(max_length=1024, null=True, blank=True)
     
     user = models.ForeignKey(
         User,
@@ -48,3 +63,32 @@ class Process(models.Model):
 
     def __str__(self):
         return f"{self.nome} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        # normpath é puro (sem syscalls): a pasta já fica canônica no banco
+        self.process_dir = os.path.normpath(PurePath(self.pathFileSDF).parent) if self.pathFileSDF else ""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "pathFileSDF" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "process_dir"}
+        super().save(*args, **kwargs)
+
+    @property
+    def sdf_path(self):
+        """pathFileSDF resolvido (absoluto)."""
+        return resolve_stored_path(self.pathFileSDF)
+
+    @property
+    def process_dir_path(self):
+        """process_dir absoluto e normalizado, sem tocar no disco (ao contrário de resolve())."""
+        path = resolve_stored_path(self.process_dir)
+        return Path(os.path.normpath(path)) if path else None
+
+    @property
+    def json_path(self):
+        """pathFileJSON resolvido (absoluto)."""
+        return resolve_stored_path(self.pathFileJSON)
+
+    @property
+    def zip_path(self):
+        """pathFileZIP resolvido (absoluto)."""
+        return resolve_stored_path(self.pathFileZIP)
@@ -7,6 +7,9 @@ from rest_framework import serializers
 from django.db import transaction
 from .models import Process
 from macromolecules.models import MacromoleculeType
+from macromolecules.serializers import CachedTypePKField
+from macromolecules.util import save_upload
+from djangoAPI.paths import to_stored_path
 
 User = get_user_model()
 
@@ -24,7 +27,7 @@ class MacromoleculeTypeMiniSerializer(serializers.ModelSerializer):
 
 class ProcessSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
-    type = serializers.PrimaryKeyRelatedField(queryset=MacromoleculeType.objects.all())
+    type = CachedTypePKField(queryset=MacromoleculeType.objects.all())
     user_detail = UserMiniSerializer(source="user", read_only=True)
     type_detail = MacromoleculeTypeMiniSerializer(source="type", read_only=True)
 
@@ -39,16 +42,17 @@ class ProcessSerializer(serializers.ModelSerializer):
             "resultado_final",
             "pathFileSDF",
             "pathFileZIP",        # ⬅ adicionar
+            "pathFileJSON",
             "user",
             "user_detail",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "pathFileZIP"]
+        read_only_fields = ["id", "created_at", "updated_at", "pathFileSDF", "pathFileZIP", "pathFileJSON"]
 
 
 class ProcessCreateSerializer(serializers.ModelSerializer):
-    type = serializers.PrimaryKeyRelatedField(queryset=MacromoleculeType.objects.all())
+    type = CachedTypePKField(queryset=MacromoleculeType.objects.all())
     sdfFile = serializers.FileField(write_only=True)
 
     class Meta:
@@ -85,12 +89,13 @@ class ProcessCreateSerializer(serializers.ModelSerializer):
 
         # 2) Monta diretório final: files/processes/<User.name-ID>/<process.name-ID>/
         dest_dir = proc_base / user_slug / proc_slug
+        # só as pastas criadas agora precisam de chmod (as existentes já foram ajustadas)
+        new_dirs = [d for d in (proc_base, proc_base / user_slug) if not d.is_dir()] + [dest_dir]
         dest_dir.mkdir(parents=True, exist_ok=True)
 
         # (Opcional) setgid e permissões amigáveis para grupo
         try:
-            for d in [proc_base, proc_base / user_slug, dest_dir]:
-                d.mkdir(parents=True, exist_ok=True)
+            for d in new_dirs:
                 d.chmod(0o2775)
         except PermissionError:
             pass
@@ -98,12 +103,10 @@ class ProcessCreateSerializer(serializers.ModelSerializer):
         # 3) Grava o arquivo no destino
         sdf_name = Path(sdf_file.name).name
         dest_path = dest_dir / sdf_name
-        with dest_path.open("wb") as f:
-            for chunk in sdf_file.chunks():
-                f.write(chunk)
+        save_upload(sdf_file, dest_path)
 
         # 4) Atualiza o path no Process
-        instance.pathFileSDF = str(dest_path)
+        instance.pathFileSDF = to_stored_path(dest_path)
         instance.save(update_fields=["pathFileSDF"])
 
         return instance
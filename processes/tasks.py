@@ -3,47 +3,112 @@ import csv
 import json
 import logging
 import os
+import queue
+import re
+import shutil
+import tempfile
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional, Tuple
 
+try:  # serializador em Rust, 2-5x mais rápido que json para o resultado.json
+    import orjson
+except ImportError:  # pragma: no cover - fallback sem orjson instalado
+    orjson = None
+
+try:  # parser em C (libxml2); mesma API de iterparse/clear
+    from lxml import etree as XML
+except ImportError:  # pragma: no cover - fallback sem lxml instalado
+    import xml.etree.ElementTree as XML
+
+import numpy as np
 from celery import shared_task
-from django.db import transaction
 from django.utils import timezone
 
 from macromolecules.models import Macromolecule
+from processes.cache import set_cached_status
 from processes.models import Process, ProcessStatusEnum
+from djangoAPI.cpus import available_cpus
+from djangoAPI.paths import to_stored_path
 
 logger = logging.getLogger(__name__)
 
 # Caminhos das ferramentas (podem ser sobrescritos por ENV no worker)
 AUTO_DOCK_GPU = os.getenv("AUTODOCK_GPU_BIN", "/home/autodockgpu/AutoDock-GPU/bin/autodock_gpu_128wi")
 OBABEL_BIN     = os.getenv("OBABEL_BIN", "/usr/bin/obabel")
+# Um AutoDock-GPU por receptor para todos os ligantes (--filelist); 0 = um por ligante
+AUTODOCK_GPU_FILELIST = os.getenv("AUTODOCK_GPU_FILELIST", "1") == "1"
+# Moléculas mínimas por bloco para dividir a conversão do SDF entre vários obabel
+OBABEL_CHUNK_MIN_MOLS = max(1, int(os.getenv("OBABEL_CHUNK_MIN_MOLS", "500")))
+# Nível do DEFLATE no ZIP final (1 = mais rápido; PDBQT/XML comprimem bem mesmo assim)
+ZIP_COMPRESSLEVEL = int(os.getenv("ZIP_COMPRESSLEVEL", "1"))
+# Receptores dockados em paralelo, um por GPU (--devnum 1..N quando N > 1)
+DOCKING_GPU_SLOTS = max(1, int(os.getenv("DOCKING_GPU_SLOTS", "1")))
+# Mesmos caminhos como Path, montados uma vez por processo
+TOOL_PATHS: Tuple[Tuple[str, Path], ...] = (
+    ("autodock_gpu", Path(AUTO_DOCK_GPU)),
+    ("obabel", Path(OBABEL_BIN)),
+)
 
 
 # ===== Helpers =====
-def run_cmd(cmd: List[str], cwd: Path, timeout: int = 600) -> str:
-    """Executa comando de sistema, logando stdout/stderr (prévia)."""
+def run_cmd(cmd: List[str], cwd: Path, timeout: int = 600, log_file: Optional[Path] = None) -> None:
+    """
+    Executa comando de sistema, logando stdout/stderr (prévia do final).
+    stdout/stderr vão para arquivos (não para a memória do worker): o log do
+    AutoDock-GPU pode ter dezenas de MB e o resultado já sai em arquivo.
+    Com `log_file`, a saída (stdout+stderr) fica nele para inspeção posterior;
+    sem, vai para arquivos temporários.
+    """
     import subprocess
     t0 = time.time()
-    logger.info("[$] %s  (cwd=%s)", " ".join(cmd), cwd)
-    try:
-        res = subprocess.run(cmd, cwd=str(cwd), text=True,
-                             capture_output=True, check=True, timeout=timeout)
-        dt = time.time() - t0
-        out_preview = (res.stdout or "")[:300]
-        err_preview = (res.stderr or "")[:300]
-        logger.debug("[OK %.1fs] stdout: %r | stderr: %r", dt, out_preview, err_preview)
-        return res.stdout
-    except subprocess.TimeoutExpired:
-        logger.error("[TIMEOUT %ss] cmd: %s", timeout, " ".join(cmd))
-        raise
-    except subprocess.CalledProcessError as e:
-        dt = time.time() - t0
-        logger.error("[ERR %.1fs] rc=%s | stderr: %r", dt, e.returncode, (e.stderr or "")[:500])
-        raise
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[$] %s  (cwd=%s)", " ".join(cmd), cwd)
+    with ExitStack() as stack:
+        if log_file is not None:
+            out_f = err_f = stack.enter_context(log_file.open("w+b"))
+            stderr = subprocess.STDOUT
+        else:
+            out_f = stack.enter_context(tempfile.TemporaryFile())
+            err_f = stderr = stack.enter_context(tempfile.TemporaryFile())
+        try:
+            subprocess.run(cmd, cwd=str(cwd), stdout=out_f, stderr=stderr,
+                           check=True, timeout=timeout)
+            if logger.isEnabledFor(logging.DEBUG):
+                dt = time.time() - t0
+                out_preview = _file_preview(out_f, 300)
+                err_preview = _file_preview(err_f, 300)
+                logger.debug("[OK %.1fs] stdout: %r | stderr: %r", dt, out_preview, err_preview)
+        except subprocess.TimeoutExpired:
+            logger.error("[TIMEOUT %ss] cmd: %s", timeout, " ".join(cmd))
+            raise
+        except subprocess.CalledProcessError as e:
+            dt = time.time() - t0
+            logger.error("[ERR %.1fs] rc=%s | stderr: %r", dt, e.returncode, _file_preview(err_f, 500))
+            raise
+
+
+def _file_preview(f, size: int) -> str:
+    """Últimos `size` bytes de um arquivo de saída, como texto (erros ficam no fim)."""
+    end = f.seek(0, os.SEEK_END)
+    f.seek(max(0, end - size))
+    return f.read(size).decode("utf-8", errors="replace")
+
+
+@lru_cache(maxsize=1)
+def validate_tools() -> None:
+    """
+    Valida as ferramentas globais uma vez por processo worker.
+    Só o sucesso fica em cache: se faltar algo, a exceção não é memorizada
+    e a próxima task verifica de novo.
+    """
+    for name, p in TOOL_PATHS:
+        if not p.exists():
+            raise FileNotFoundError(f"{name} não encontrado em {p}")
 
 
 def ensure_exists(path: Path, is_file: bool = False):
@@ -55,13 +120,103 @@ def ensure_exists(path: Path, is_file: bool = False):
 
 
 # ===== Split de SDF em PDBQT (OpenBabel) =====
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def _natural_key(name: str) -> List:
+    # re.split com grupo alterna texto/número, então as posições sempre comparam o mesmo tipo
+    parts = _DIGITS_RE.split(name)
+    parts[1::2] = [int(d) for d in parts[1::2]]
+    return parts
+
+
+def _chunk_sdf(sdf_file: Path, work_dir: Path, chunks: int) -> List[Tuple[Path, int, List[int]]]:
+    """
+    Divide o SDF em até `chunks` arquivos com quantidades ~iguais de moléculas
+    (fronteira nas linhas '$$$$'), cada um com o mesmo nome do SDF original.
+    Retorna (arquivo, nº de moléculas antes do bloco, índices 1-based no bloco
+    das moléculas sem título) por bloco, ou [] se não houver moléculas
+    suficientes para 2 blocos.
+    """
+    with sdf_file.open("rb") as f:
+        total = sum(1 for line in f if line.startswith(b"$$$$"))
+    chunks = min(chunks, total // OBABEL_CHUNK_MIN_MOLS)
+    if chunks < 2:
+        return []
+
+    per_chunk = -(-total // chunks)  # teto
+    result: List[Tuple[Path, int, List[int]]] = []
+    out = None
+    count = per_chunk
+    offset = 0
+    mol_start = True
+    with sdf_file.open("rb") as f:
+        for line in f:
+            if count >= per_chunk:
+                if out is not None:
+                    out.close()
+                    offset += count
+                chunk_dir = work_dir / f"chunk_{len(result)}"
+                chunk_dir.mkdir(parents=True, exist_ok=True)
+                result.append((chunk_dir / sdf_file.name, offset, []))
+                out = result[-1][0].open("wb")
+                count = 0
+            if mol_start and not line.strip():
+                # linha de título vazia: o obabel nomeia pelo arquivo + índice
+                result[-1][2].append(count + 1)
+            mol_start = False
+            out.write(line)
+            if line.startswith(b"$$$$"):
+                count += 1
+                mol_start = True
+    if out is not None:
+        out.close()
+    return result
+
+
 def split_sdf_to_pdbqt(sdf_file: Path, out_dir: Path) -> List[Path]:
-    """Converte um SDF multi-moléculas em vários .pdbqt no diretório out_dir."""
+    """
+    Converte um SDF multi-moléculas em vários .pdbqt no diretório out_dir.
+    SDFs grandes são divididos em blocos convertidos por vários obabel em
+    paralelo (cada um no seu diretório); os .pdbqt são movidos para out_dir
+    com os mesmos nomes que um obabel único geraria.
+    Retorna os .pdbqt de out_dir em ordem natural de nome (_natural_key).
+    """
     ensure_exists(out_dir, is_file=False)
-    # Gera arquivos numerados: ligand1.pdbqt, ligand2.pdbqt, ...
-    cmd = [OBABEL_BIN, "-isdf", str(sdf_file), "-opdbqt", "--split"]
-    run_cmd(cmd, cwd=out_dir, timeout=1800)  # até 30min para SDFs grandes
-    files = sorted(out_dir.glob("*.pdbqt"))
+    cpus = available_cpus()
+    work_dir = Path(tempfile.mkdtemp(prefix=".obabel_", dir=out_dir))
+    try:
+        chunks = _chunk_sdf(sdf_file, work_dir, cpus)
+        if not chunks:
+            # Um único obabel: arquivos nomeados pelo título de cada molécula
+            cmd = [OBABEL_BIN, "-isdf", str(sdf_file), "-opdbqt", "--split"]
+            run_cmd(cmd, cwd=out_dir, timeout=1800)  # até 30min para SDFs grandes
+        else:
+            def _convert(chunk: Path) -> None:
+                run_cmd([OBABEL_BIN, "-isdf", chunk.name, "-opdbqt", "--split"],
+                        cwd=chunk.parent, timeout=1800)
+
+            # threads bastam: o trabalho pesado é dos processos obabel
+            with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+                list(pool.map(_convert, [chunk for chunk, _, _ in chunks]))
+
+            # Blocos em ordem, sobrescrevendo como o obabel único faz com títulos
+            # repetidos; moléculas sem título (<stem><índice no bloco>) ganham o
+            # índice no SDF inteiro.
+            stem = sdf_file.stem
+            for chunk, offset, untitled in chunks:
+                renames = {f"{stem}{i}.pdbqt": f"{stem}{offset + i}.pdbqt" for i in untitled}
+                with os.scandir(chunk.parent) as it:
+                    for e in it:
+                        if e.name.endswith(".pdbqt"):
+                            os.replace(e.path, out_dir / renames.get(e.name, e.name))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # scandir (sem stat por entrada) + ordem natural: ligand2 antes de ligand10
+    with os.scandir(out_dir) as it:
+        names = [e.name for e in it if e.name.endswith(".pdbqt")]
+    files = [out_dir / n for n in sorted(names, key=_natural_key)]
     logger.info("OpenBabel gerou %d ligantes .pdbqt", len(files))
     return files
 
@@ -73,57 +228,130 @@ def extract_best_from_xml(xml_path: Path) -> Tuple[float, float, int]:
       (binding_energy_correspondente_ao_menor_reference_rmsd, menor_reference_rmsd, run_id)
     """
     ensure_exists(xml_path, is_file=True)
-    root = ET.parse(xml_path).getroot()
-    rmsd_table = root.find(".//rmsd_table")
-    if rmsd_table is None:
-        raise ValueError(f"<rmsd_table> não encontrado em {xml_path.name}")
 
-    best_rmsd: Optional[float] = None
-    best_energy: Optional[float] = None
-    best_run: Optional[int] = None
+    rmsds: List[Optional[str]] = []
+    runs: List[Tuple[Optional[str], Optional[str]]] = []
+    table = None
+
+    # Streaming: lê o arquivo só até fechar a <rmsd_table>, sem montar o DOM;
+    # de cada <run> só os atributos (texto) são guardados, e o nó é removido
+    for event, el in XML.iterparse(str(xml_path), events=("start", "end")):
+        if el.tag == "rmsd_table":
+            if event == "end":
+                break
+            table = el
+        elif event == "end":
+            if table is not None and el.tag == "run":
+                rmsds.append(el.get("reference_rmsd"))
+                runs.append((el.get("binding_energy"), el.get("run")))
+                el.clear()
+                try:
+                    table.remove(el)
+                except ValueError:  # <run> aninhado, não filho direto
+                    pass
+            else:
+                el.clear()
+
+    if table is None:
+        raise ValueError(f"<rmsd_table> não encontrado em {xml_path.name}")
 
-    for run_el in rmsd_table.findall("run"):
+    # Conversão e argmin vetorizados; valores inválidos viram NaN e são ignorados
+    rmsd_arr = _to_float_array(rmsds)
+    while rmsd_arr.size and not np.isnan(rmsd_arr).all():
+        i = int(np.nanargmin(rmsd_arr))  # primeiro mínimo, como na comparação estrita
         try:
-            rmsd = float(run_el.get("reference_rmsd"))
-            energy = float(run_el.get("binding_energy"))
-            run_id = int(run_el.get("run"))
+            # energia/run só do melhor; se inválidos, o run é descartado e tenta o próximo
+            return float(runs[i][0]), float(rmsd_arr[i]), int(runs[i][1])
         except (TypeError, ValueError):
-            continue
+            rmsd_arr[i] = np.nan
 
-        if best_rmsd is None or rmsd < best_rmsd:
-            best_rmsd = rmsd
-            best_energy = energy
-            best_run = run_id
+    raise ValueError(f"Nenhum run válido em {xml_path.name}")
 
-    if best_rmsd is None or best_energy is None or best_run is None:
-        raise ValueError(f"Nenhum run válido em {xml_path.name}")
 
-    return best_energy, best_rmsd, best_run
+def _to_float_array(values: List[Optional[str]]) -> "np.ndarray":
+    """float64 de uma lista de textos; ausentes/inválidos viram NaN."""
+    try:
+        return np.array(values, dtype=np.float64)  # None já vira NaN
+    except ValueError:
+        out = np.full(len(values), np.nan)
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except (TypeError, ValueError):
+                pass
+        return out
 
 
 # ===== Execução do AutoDock-GPU =====
-def run_autodock_gpu(fld_file: Path, ligand_pdbqt: Path, out_prefix: Path) -> Path:
+def _devnum_args(devnum: Optional[int]) -> List[str]:
+    return ["--devnum", str(devnum)] if devnum else []
+
+
+def run_autodock_gpu(fld_file: Path, ligand_pdbqt: Path, out_prefix: Path,
+                     devnum: Optional[int] = None, log_file: Optional[Path] = None) -> Path:
     """
     Executa o AutoDock-GPU:
       autodock_gpu_128wi --ffile receptor.maps.fld --lfile lig.pdbqt --gbest 1 --resnam <out_prefix>
     Retorna o caminho do XML gerado (<out_prefix>.xml).
+    Sem stat prévio: o fld é validado uma vez por receptor (dock_receptor), os
+    ligantes vêm do split do OpenBabel e o diretório de saída de
+    prepare_process_dirs. A existência do XML é conferida em extract_best_from_xml.
     """
-    ensure_exists(fld_file, is_file=True)
-    ensure_exists(ligand_pdbqt, is_file=True)
-    ensure_exists(out_prefix.parent, is_file=False)
-
     cmd = [
         AUTO_DOCK_GPU,
         "--ffile", str(fld_file),
         "--lfile", str(ligand_pdbqt),
         "--gbest", "1",
-        "--resnam", str(out_prefix)
+        "--resnam", str(out_prefix),
+        *_devnum_args(devnum),
     ]
-    run_cmd(cmd, cwd=fld_file.parent, timeout=3600)  # até 1h
+    run_cmd(cmd, cwd=fld_file.parent, timeout=3600, log_file=log_file)  # até 1h
 
-    xml_path = Path(str(out_prefix) + ".xml")
-    ensure_exists(xml_path, is_file=True)
-    return xml_path
+    return Path(str(out_prefix) + ".xml")
+
+
+def run_autodock_gpu_batch(fld_file: Path, jobs: List[Tuple[Path, Path]],
+                           devnum: Optional[int] = None,
+                           log_file: Optional[Path] = None) -> Dict[Path, Path]:
+    """
+    Executa o AutoDock-GPU uma única vez para vários ligantes do mesmo receptor
+    (--filelist): um só contexto de GPU/setup para o lote inteiro.
+    jobs = [(ligante.pdbqt, out_prefix), ...]
+    Retorna {ligante: xml} só para os ligantes cujo XML foi gerado; os demais
+    ficam para a execução individual (run_autodock_gpu).
+    Mesmas pré-condições de run_autodock_gpu (fld e diretório de saída já existem).
+    """
+    out_dir = jobs[0][1].parent
+
+    # Formato do batch: fld na 1ª linha (vale para todos), depois pares lfile/resnam
+    lines = [str(fld_file)]
+    for lig, out_prefix in jobs:
+        Path(str(out_prefix) + ".xml").unlink(missing_ok=True)  # sem XML velho de retry
+        lines += [str(lig), str(out_prefix)]
+    # Nome único: receptores com o mesmo .maps.fld podem rodar ao mesmo tempo
+    fd, name = tempfile.mkstemp(prefix=f"{fld_file.name}.", suffix=".filelist.txt", dir=out_dir)
+    filelist = Path(name)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    try:
+        run_cmd(
+            [AUTO_DOCK_GPU, "--filelist", str(filelist), "--gbest", "1", *_devnum_args(devnum)],
+            cwd=fld_file.parent,
+            timeout=3600 * len(jobs),  # até 1h por ligante
+            log_file=log_file,
+        )
+    except Exception as e:
+        logger.warning("Batch AutoDock-GPU falhou para %s (%d ligantes): %s", fld_file.name, len(jobs), e)
+    finally:
+        filelist.unlink(missing_ok=True)
+
+    results: Dict[Path, Path] = {}
+    for lig, out_prefix in jobs:
+        xml_path = Path(str(out_prefix) + ".xml")
+        if xml_path.exists():
+            results[lig] = xml_path
+    return results
 
 
 # ===== Estrutura de diretórios do processo =====
@@ -138,8 +366,13 @@ def prepare_process_dirs(sdf_path: Path, process_id: str) -> Dict[str, Path]:
     gbest  = base / "gbest_pdb"
     logs   = base / "logs"
 
+    # chmod só nas pastas criadas agora (as existentes já foram ajustadas; em
+    # NFS cada chmod é uma escrita de metadados). `base` vem do upload do SDF.
     for d in (base, lig_dir, dlgs, gbest, logs):
-        d.mkdir(parents=True, exist_ok=True)
+        try:
+            d.mkdir(parents=True)
+        except FileExistsError:
+            continue
         try:
             os.chmod(d, 0o2775)  # herança de grupo, rwx para user/group
         except PermissionError:
@@ -158,42 +391,275 @@ def prepare_process_dirs(sdf_path: Path, process_id: str) -> Dict[str, Path]:
 def get_macromolecules_for_process(proc: Process) -> List[Macromolecule]:
     """
     Busca macromoléculas do mesmo 'type' do processo (ordenadas por 'rec').
+    O type vem no mesmo SELECT (m.type.name/redocking são lidos por receptor).
     """
-    return list(Macromolecule.objects.filter(type=proc.type).order_by("rec"))
+    return list(
+        Macromolecule.objects.filter(type=proc.type)
+        .select_related("type")
+        .order_by("rec")
+    )
 
 
 # ===== CSV simples =====
-def write_rows_csv(csv_path: Path, rows: List[Dict]):
-    if not rows:
-        # Cria CSV vazio com headers mínimos mesmo sem dados
-        with csv_path.open("w", encoding="utf-8", newline="") as f:
-            headers = ["PROCESS_ID", "TYPE", "RECEPTOR_REC", "LIGAND_FILE", 
-                      "BEST_BINDING_ENERGY", "BEST_REFERENCE_RMSD", "BEST_RUN", "ERROR"]
-            w = csv.DictWriter(f, fieldnames=headers, delimiter=";")
+CSV_HEADERS = ["PROCESS_ID", "TYPE", "RECEPTOR_REC", "LIGAND_FILE",
+               "BEST_BINDING_ENERGY", "BEST_REFERENCE_RMSD", "BEST_RUN", "ERROR"]
+
+
+def write_rows_csv(csv_path: Path, rows: List[Dict], append: bool = False):
+    """
+    Grava linhas no CSV com o esquema fixo CSV_HEADERS.
+    append=False cria o arquivo (só o header, se rows estiver vazio); append=True
+    acrescenta as linhas de mais um receptor, sem manter o processo inteiro em memória.
+    """
+    with csv_path.open("a" if append else "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=CSV_HEADERS, delimiter=";", extrasaction="ignore")
+        if not append:
             w.writeheader()
-        return
-        
-    headers = sorted({k for r in rows for k in r.keys()})
-    with csv_path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=headers, delimiter=";")
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        w.writerows(rows)
+
+
+# ===== JSON do resultado =====
+def write_json(json_path: Path, payload: Dict):
+    """Grava o payload indentado em UTF-8 (orjson quando disponível)."""
+    if orjson is not None:
+        json_path.write_bytes(orjson.dumps(
+            payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ))
+    else:
+        json_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
 # ===== ZIP do resultado =====
-def zip_tree(folder: Path, zip_path: Path):
+def _iter_files(root) -> Iterator[str]:
+    """
+    Caminhos dos arquivos sob `root` (recursivo) via os.scandir: o tipo vem do
+    d_type da listagem, sem um stat() por entrada como rglob() + is_file().
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
+
+class ResultZip:
+    """
+    ZIP do processo gravado aos poucos: os arquivos de cada receptor entram
+    assim que ele termina (a compressão se sobrepõe ao docking dos outros) e,
+    no fim, add_remaining() inclui o que ainda faltar em `root`.
+    A compressão é sequencial: a API pública do zipfile não grava membros já
+    comprimidos, e cada ZipFile aceita um só writer por vez.
+    """
+
+    def __init__(self, zip_path: Path, root: Path):
+        self.zip_path = zip_path
+        self.root = root
+        self._added = set()
+        self._zip = zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED,
+                                    compresslevel=ZIP_COMPRESSLEVEL, allowZip64=True)
+
+    def add(self, paths) -> None:
+        """Adiciona os arquivos existentes de `paths` ainda não incluídos."""
+        for p in paths:
+            if p in self._added or p == self.zip_path:
+                continue
+            try:
+                self._zip.write(p, p.relative_to(self.root))
+            except FileNotFoundError:
+                continue
+            self._added.add(p)
+
+    def add_remaining(self) -> None:
+        # o próprio .zip fica dentro de `root`: add() o ignora
+        self.add(Path(path) for path in _iter_files(self.root))
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+# ===== Docking por receptor (paralelo entre GPUs) =====
+@lru_cache(maxsize=1)
+def _docking_pool() -> ThreadPoolExecutor:
+    """
+    Pool persistente do processo worker, um thread por slot de GPU.
+    Threads (e não processos): o custo está no AutoDock-GPU, que é um
+    subprocess, e os filhos do prefork do Celery não podem ter seus próprios
+    processos filhos (são daemonic).
+    """
+    return ThreadPoolExecutor(max_workers=DOCKING_GPU_SLOTS, thread_name_prefix="docking")
+
+
+@lru_cache(maxsize=1)
+def _gpu_devices() -> "queue.Queue[Optional[int]]":
+    """Fila de GPUs livres (--devnum é 1-based); None = deixa o AutoDock-GPU escolher."""
+    q: "queue.Queue[Optional[int]]" = queue.Queue()
+    for dev in (range(1, DOCKING_GPU_SLOTS + 1) if DOCKING_GPU_SLOTS > 1 else [None]):
+        q.put(dev)
+    return q
+
+
+def dock_receptor(process_id: str, m: Macromolecule, ligands: List[Path],
+                  dlgs_dir: Path, gbest_dir: Path,
+                  logs_dir: Optional[Path] = None) -> Tuple[Dict, List[Dict], int, int]:
+    """
+    Docka todos os ligantes contra um receptor, numa GPU reservada da fila.
+    Retorna (rec_block, linhas do CSV, ligantes ok, ligantes com falha).
+    Só lê atributos já carregados de `m` (sem acesso ao banco fora do thread principal).
+    Com `logs_dir`, a saída de cada AutoDock-GPU fica em logs/<receptor|resnam>.log.
+    """
+    rec_block: Dict = {
+        "macromolecule_id": str(m.id),
+        "receptor_rec": m.rec.upper(),
+        "receptor_nome": m.nome,
+        "grid_size": m.gridsize,
+        "grid_center": m.gridcenter,
+        "fld": m.pathFilefld,
+        "ligantes": [],
+        "status": "processing",  # novo campo de status
+    }
+    csv_rows: List[Dict] = []
+    type_name = m.type.name if m.type else ""
+    if m.type.redocking:
+        rec_block.update({
+            "rmsd_redocking": m.rmsd_redocking,
+            "ligante_original": m.ligante_original,
+            "energia_original": m.energia_original,
+        })
+    # Resolve path do fld (*.maps.fld) por receptor
     try:
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as z:
-            for p in folder.rglob("*"):
-                if p.is_file():
-                    z.write(p, p.relative_to(folder))
+        fld_path = m.fld_path
+        if fld_path is None:
+            raise FileNotFoundError("pathFilefld não definido")
+        if fld_path.is_dir():
+            found = list(fld_path.glob("*.maps.fld"))
+            if not found:
+                raise FileNotFoundError(f"Nenhum .maps.fld encontrado em {fld_path}")
+            fld_path = found[0]
+        if not fld_path.exists():
+            raise FileNotFoundError(f"Arquivo .maps.fld não existe: {fld_path}")
     except Exception as e:
-        logger.warning("Erro ao criar ZIP: %s", e)
+        # ❗️Erro POR MACROMOLÉCULA (não aborta processo)
+        rec_block["error"] = f"fld_error: {e}"
+        rec_block["status"] = "error"
+        rec_block["ligantes_ok"] = 0
+        rec_block["ligantes_failed"] = len(ligands)
+
+        # Adiciona linhas de erro no CSV para cada ligante que não foi processado
+        for lig in ligands:
+            csv_rows.append({
+                "PROCESS_ID": process_id,
+                "TYPE": type_name,
+                "RECEPTOR_REC": m.rec,
+                "LIGAND_FILE": lig.name,
+                "ERROR": f"Receptor error: {e}",
+            })
+
+        logger.warning("⚠️ Receptor %s ignorado: %s", m.rec, e)
+        return rec_block, csv_rows, 0, len(ligands)
+
+    ok_ligs = 0
+    failed_ligs = 0
+
+    devices = _gpu_devices()
+    devnum = devices.get()
+    try:
+        # Todos os ligantes deste receptor num único AutoDock-GPU (--filelist)
+        batch_xmls: Dict[Path, Path] = {}
+        if AUTODOCK_GPU_FILELIST and len(ligands) > 1:
+            batch_xmls = run_autodock_gpu_batch(
+                fld_path, [(lig, dlgs_dir / f"{lig.stem}_{m.rec}") for lig in ligands], devnum,
+                log_file=logs_dir / f"{m.rec}.log" if logs_dir else None,
+            )
+
+        for lig in ligands:
+            out_prefix = dlgs_dir / f"{lig.stem}_{m.rec}"
+            lig_result = {"ligand": lig.name}
+
+            try:
+                # Executa AutoDock-GPU (individual só se o lote não gerou o XML)
+                xml_path = batch_xmls.get(lig) or run_autodock_gpu(
+                    fld_path, lig, out_prefix, devnum,
+                    log_file=logs_dir / f"{out_prefix.name}.log" if logs_dir else None,
+                )
+
+                # Extrai melhores resultados
+                best_energy, best_rmsd, best_run = extract_best_from_xml(xml_path)
+
+                ok_ligs += 1
+
+                lig_result.update({
+                    "best_binding_energy": best_energy,
+                    "best_reference_rmsd": best_rmsd,
+                    "best_run": best_run,
+                    "xml": str(xml_path),
+                    "status": "success",
+                })
+
+                csv_rows.append({
+                    "PROCESS_ID": process_id,
+                    "TYPE": type_name,
+                    "RECEPTOR_REC": m.rec,
+                    "LIGAND_FILE": lig.name,
+                    "BEST_BINDING_ENERGY": best_energy,
+                    "BEST_REFERENCE_RMSD": best_rmsd,
+                    "BEST_RUN": best_run,
+                })
+
+                # Move a melhor pose (<resnam>.pdbqt, se gerada): nome conhecido, sem glob no diretório
+                try:
+                    Path(str(out_prefix) + ".pdbqt").replace(gbest_dir / f"{out_prefix.name}.pdbqt")
+                except FileNotFoundError:
+                    pass
+                except OSError as mv_err:
+                    logger.debug("Erro ao mover arquivo gbest: %s", mv_err)
+
+            except Exception as e:
+                # ❗️Erro POR LIGANTE (não aborta receptor/processo)
+                failed_ligs += 1
+
+                error_msg = str(e)
+                logger.warning("⚠️ Ligante %s falhou em %s: %s", lig.name, m.rec, error_msg)
+
+                lig_result.update({
+                    "error": error_msg,
+                    "status": "error",
+                })
+
+                # Adiciona linha de erro no CSV
+                csv_rows.append({
+                    "PROCESS_ID": process_id,
+                    "TYPE": type_name,
+                    "RECEPTOR_REC": m.rec,
+                    "LIGAND_FILE": lig.name,
+                    "ERROR": error_msg,
+                })
+
+            rec_block["ligantes"].append(lig_result)
+    finally:
+        devices.put(devnum)
+
+    # Atualiza estatísticas do receptor
+    rec_block["ligantes_ok"] = ok_ligs
+    rec_block["ligantes_failed"] = failed_ligs
+    rec_block["status"] = "completed" if ok_ligs > 0 else "failed"
+    return rec_block, csv_rows, ok_ligs, failed_ligs
+
+
+def receptor_outputs(m: Macromolecule, ligands: List[Path],
+                     dlgs_dir: Path, gbest_dir: Path) -> List[Path]:
+    """Arquivos que o docking de um receptor pode ter gerado (XML/DLG e melhor pose)."""
+    out: List[Path] = []
+    for lig in ligands:
+        name = f"{lig.stem}_{m.rec}"
+        out += [dlgs_dir / f"{name}.xml", dlgs_dir / f"{name}.dlg", gbest_dir / f"{name}.pdbqt"]
+    return out
 
 
 # ===== Tarefa Celery principal =====
-@shared_task(name="processes.run_plasmodocking_process")
+@shared_task(name="processes.run_plasmodocking_process", ignore_result=True)
 def run_plasmodocking_process(process_id: str) -> dict:
     """
     Executa o pipeline do 'Process':
@@ -216,25 +682,24 @@ def run_plasmodocking_process(process_id: str) -> dict:
         logger.error("Processo %s não encontrado", process_id)
         return {"ok": False, "error": "process_not_found"}
 
-    # Atualiza status -> PROCESSANDO
-    with transaction.atomic():
-        proc.status = ProcessStatusEnum.PROCESSANDO
-        proc.updated_at = timezone.now()
-        proc.save(update_fields=["status", "updated_at"])
+    # Atualiza status -> PROCESSANDO (um UPDATE só, já atômico por si)
+    Process.objects.filter(pk=proc.pk).update(
+        status=ProcessStatusEnum.PROCESSANDO, updated_at=timezone.now()
+    )
+    set_cached_status(proc.pk, ProcessStatusEnum.PROCESSANDO, proc.user_id)
 
     # Valida ferramentas globais (erros globais abortam)
-    for name, p in [("autodock_gpu", Path(AUTO_DOCK_GPU)), ("obabel", Path(OBABEL_BIN))]:
-        if not p.exists():
-            msg = f"{name} não encontrado em {p}"
-            logger.error(msg)
-            _fail_process(proc, msg)
-            return {"ok": False, "error": msg}
+    try:
+        validate_tools()
+    except FileNotFoundError as e:
+        msg = str(e)
+        logger.error(msg)
+        _fail_process(proc, msg)
+        return {"ok": False, "error": msg}
 
     # Valida SDF (erro global aborta)
-    sdf_path = Path(proc.pathFileSDF)
-    if not sdf_path.is_absolute():
-        sdf_path = Path.cwd() / sdf_path
-    if not sdf_path.exists():
+    sdf_path = proc.sdf_path
+    if not sdf_path or not sdf_path.exists():
         msg = f"SDF não encontrado: {sdf_path}"
         logger.error(msg)
         _fail_process(proc, msg)
@@ -262,7 +727,24 @@ def run_plasmodocking_process(process_id: str) -> dict:
 
     # -------- Loop principal com tolerância a erros por receptor/ligante --------
     macs_results: List[Dict] = []
-    csv_rows: List[Dict] = []
+    
+    # CSV gravado receptor a receptor, conforme cada um termina
+    csv_path = paths["base"] / "resultado.csv"
+    csv_ok = True
+    try:
+        write_rows_csv(csv_path, [])
+    except Exception as e:
+        csv_ok = False
+        logger.error("Erro ao salvar CSV: %s", e)
+    
+    # ZIP gravado junto: saídas de cada receptor entram assim que ele termina
+    zip_path: Optional[Path] = paths["base"] / f"{paths['base'].name}.zip"
+    try:
+        result_zip: Optional[ResultZip] = ResultZip(zip_path, paths["base"])
+        result_zip.add(ligands)
+    except Exception as e:
+        logger.error("Erro ao criar ZIP: %s", e)
+        result_zip, zip_path = None, None
     
     # Contadores globais para estatísticas
     total_combinations = len(macs) * len(ligands)
@@ -270,128 +752,29 @@ def run_plasmodocking_process(process_id: str) -> dict:
     failed_combinations = 0
     skipped_receptors = 0
 
-    for m in macs:
-        rec_block: Dict = {
-            "macromolecule_id": str(m.id),
-            "receptor_rec": m.rec.upper(),
-            "receptor_nome": m.nome,
-            "grid_size": m.gridsize,
-            "grid_center": m.gridcenter,
-            "fld": m.pathFilefld,
-            "ligantes": [],
-            "status": "processing",  # novo campo de status
-        }
-        if m.type.redocking:
-            rec_block.update({
-                "rmsd_redocking": m.rmsd_redocking,
-                "ligante_original": m.ligante_original,
-                "energia_original": m.energia_original,
-            })
-        # Resolve path do fld (*.maps.fld) por receptor
-        try:
-            fld_path = Path(m.pathFilefld)
-            if fld_path.is_dir():
-                found = list(fld_path.glob("*.maps.fld"))
-                if not found:
-                    raise FileNotFoundError(f"Nenhum .maps.fld encontrado em {fld_path}")
-                fld_path = found[0]
-            if not fld_path.exists():
-                raise FileNotFoundError(f"Arquivo .maps.fld não existe: {fld_path}")
-        except Exception as e:
-            # ❗️Erro POR MACROMOLÉCULA (não aborta processo)
-            rec_block["error"] = f"fld_error: {e}"
-            rec_block["status"] = "error"
-            rec_block["ligantes_ok"] = 0
-            rec_block["ligantes_failed"] = len(ligands)
-            macs_results.append(rec_block)
-            skipped_receptors += 1
-            failed_combinations += len(ligands)
-            
-            # Adiciona linhas de erro no CSV para cada ligante que não foi processado
-            for lig in ligands:
-                csv_rows.append({
-                    "PROCESS_ID": str(proc.id),
-                    "TYPE": m.type.name if m.type else "",
-                    "RECEPTOR_REC": m.rec,
-                    "LIGAND_FILE": lig.name,
-                    "ERROR": f"Receptor error: {e}",
-                })
-            
-            logger.warning("⚠️ Receptor %s ignorado: %s", m.rec, e)
-            continue
+    def _dock(m: Macromolecule) -> Tuple[Dict, List[Dict], int, int]:
+        return dock_receptor(str(proc.id), m, ligands, dlgs_dir, gbest_dir, paths["logs"])
 
-        ok_ligs = 0
-        failed_ligs = 0
-        
-        for lig in ligands:
-            out_prefix = dlgs_dir / f"{lig.stem}_{m.rec}"
-            lig_result = {"ligand": lig.name}
-            
+    # Um receptor por slot de GPU; a ordem dos resultados segue a de `macs`
+    for m, (rec_block, rows, ok_ligs, failed_ligs) in zip(macs, _docking_pool().map(_dock, macs)):
+        macs_results.append(rec_block)
+        if result_zip is not None:
             try:
-                # Executa AutoDock-GPU
-                xml_path = run_autodock_gpu(fld_path, lig, out_prefix)
-                
-                # Extrai melhores resultados
-                best_energy, best_rmsd, best_run = extract_best_from_xml(xml_path)
-                
-                ok_ligs += 1
-                successful_combinations += 1
-
-                lig_result.update({
-                    "best_binding_energy": best_energy,
-                    "best_reference_rmsd": best_rmsd,
-                    "best_run": best_run,
-                    "xml": str(xml_path),
-                    "status": "success",
-                })
-
-                csv_rows.append({
-                    "PROCESS_ID": str(proc.id),
-                    "TYPE": m.type.name if m.type else "",
-                    "RECEPTOR_REC": m.rec,
-                    "LIGAND_FILE": lig.name,
-                    "BEST_BINDING_ENERGY": best_energy,
-                    "BEST_REFERENCE_RMSD": best_rmsd,
-                    "BEST_RUN": best_run,
-                })
-
-                # Move melhores saídas combinadas (se existirem)
-                try:
-                    for cand in out_prefix.parent.glob(f"{out_prefix.name}*.pdbqt"):
-                        dest = gbest_dir / cand.name
-                        cand.replace(dest)
-                except Exception as mv_err:
-                    logger.debug("Erro ao mover arquivo gbest: %s", mv_err)
-
+                result_zip.add(receptor_outputs(m, ligands, dlgs_dir, gbest_dir))
             except Exception as e:
-                # ❗️Erro POR LIGANTE (não aborta receptor/processo)
-                failed_ligs += 1
-                failed_combinations += 1
-                
-                error_msg = str(e)
-                logger.warning("⚠️ Ligante %s falhou em %s: %s", lig.name, m.rec, error_msg)
-                
-                lig_result.update({
-                    "error": error_msg,
-                    "status": "error",
-                })
-                
-                # Adiciona linha de erro no CSV
-                csv_rows.append({
-                    "PROCESS_ID": str(proc.id),
-                    "TYPE": m.type.name if m.type else "",
-                    "RECEPTOR_REC": m.rec,
-                    "LIGAND_FILE": lig.name,
-                    "ERROR": error_msg,
-                })
-            
-            rec_block["ligantes"].append(lig_result)
-
-        # Atualiza estatísticas do receptor
-        rec_block["ligantes_ok"] = ok_ligs
-        rec_block["ligantes_failed"] = failed_ligs
-        rec_block["status"] = "completed" if ok_ligs > 0 else "failed"
-        macs_results.append(rec_block)
+                logger.error("Erro ao criar ZIP: %s", e)
+                result_zip.close()
+                result_zip, zip_path = None, None
+        if csv_ok:
+            try:
+                write_rows_csv(csv_path, rows, append=True)
+            except Exception as e:
+                csv_ok = False
+                logger.error("Erro ao salvar CSV: %s", e)
+        successful_combinations += ok_ligs
+        failed_combinations += failed_ligs
+        if rec_block["status"] == "error":
+            skipped_receptors += 1
 
     # -------- Determinação do status final do processo --------
     total_time = time.time() - t_all
@@ -429,42 +812,43 @@ def run_plasmodocking_process(process_id: str) -> dict:
     }
 
     # Salva JSON
-    json_path = paths["base"] / "resultado.json"
+    json_path: Optional[Path] = paths["base"] / "resultado.json"
     try:
-        json_path.write_text(json.dumps(results_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(json_path, results_payload)
         logger.info("✅ JSON salvo: %s", json_path)
     except Exception as e:
         logger.error("Erro ao salvar JSON: %s", e)
+        json_path = None
 
-    # Salva CSV
-    csv_path = paths["base"] / "resultado.csv"
-    try:
-        write_rows_csv(csv_path, csv_rows)
+    if csv_ok:
         logger.info("✅ CSV salvo: %s", csv_path)
-    except Exception as e:
-        logger.error("Erro ao salvar CSV: %s", e)
-
-    # Cria ZIP
-    zip_path = paths["base"] / f"{paths['base'].name}.zip"
-    try:
-        zip_tree(paths["base"], zip_path)
-        logger.info("✅ ZIP criado: %s", zip_path)
-    except Exception as e:
-        logger.error("Erro ao criar ZIP: %s", e)
-        zip_path = None
 
-    # Atualiza Process com resultado final
-    with transaction.atomic():
-        proc.resultado_final = results_payload
-        proc.status = final_status
-        proc.updated_at = timezone.now()
-        proc.pathFileZIP = str(zip_path) if zip_path else None  
-        proc.save(update_fields=["resultado_final", "status", "updated_at", "pathFileZIP"])
+    # Fecha o ZIP com o que ainda falta (SDF, JSON, CSV, logs)
+    if result_zip is not None:
+        try:
+            try:
+                result_zip.add_remaining()
+            finally:
+                result_zip.close()
+            logger.info("✅ ZIP criado: %s", zip_path)
+        except Exception as e:
+            logger.error("Erro ao criar ZIP: %s", e)
+            zip_path = None
+
+    # Atualiza Process com resultado final (um UPDATE só, já atômico por si)
+    Process.objects.filter(pk=proc.pk).update(
+        resultado_final=results_payload,
+        status=final_status,
+        updated_at=timezone.now(),
+        pathFileZIP=to_stored_path(zip_path) if zip_path else None,
+        pathFileJSON=to_stored_path(json_path) if json_path else None,
+    )
+    set_cached_status(proc.pk, final_status, proc.user_id)
 
     logger.info(
         "🎉 Processo %s finalizado em %.1fs | Status: %s | Sucesso: %d/%d | json=%s | csv=%s | zip=%s",
         proc.id, total_time, status_msg, successful_combinations, total_combinations,
-        json_path, csv_path, zip_path or "N/A"
+        json_path or "N/A", csv_path, zip_path or "N/A"
     )
 
     return {
@@ -472,7 +856,7 @@ def run_plasmodocking_process(process_id: str) -> dict:
         "process_id": str(proc.id),
         "status": status_msg,
         "statistics": results_payload["statistics"],
-        "json": str(json_path),
+        "json": str(json_path) if json_path else None,
         "csv": str(csv_path),
         "zip": str(zip_path) if zip_path else None,
         "elapsed_sec": total_time,
@@ -481,16 +865,18 @@ def run_plasmodocking_process(process_id: str) -> dict:
 
 def _fail_process(proc: Process, msg: str):
     """Marca processo como ERROR e salva mensagem no resultado_final"""
-    with transaction.atomic():
-        proc.status = ProcessStatusEnum.ERROR
-        proc.resultado_final = {
+    now = timezone.now()
+    Process.objects.filter(pk=proc.pk).update(
+        status=ProcessStatusEnum.ERROR,
+        resultado_final={
             "ok": False,
             "error": msg,
             "process_id": str(proc.id),
-            "timestamp": timezone.now().isoformat(),
-        }
-        proc.updated_at = timezone.now()
-        proc.save(update_fields=["status", "resultado_final", "updated_at"])
+            "timestamp": now.isoformat(),
+        },
+        updated_at=now,
+    )
+    set_cached_status(proc.pk, ProcessStatusEnum.ERROR, proc.user_id)
     logger.error("❌ Processo %s marcado como ERROR: %s", proc.id, msg)
 
 
@@ -1,3 +1,98 @@
-from django.test import TestCase
+import shutil
+import sys
+import tempfile
+import textwrap
+import zipfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from processes import tasks
+from processes.tasks import ResultZip, split_sdf_to_pdbqt
+
+# Imita o `obabel -isdf X -opdbqt --split`: um arquivo por molécula com o
+# título como nome; sem título, <stem do arquivo de entrada><índice 1-based>;
+# títulos repetidos sobrescrevem.
+FAKE_OBABEL = textwrap.dedent("""\
+    #!{python}
+    import os, sys
+    src = sys.argv[sys.argv.index("-isdf") + 1]
+    stem = os.path.splitext(os.path.basename(src))[0]
+    blocks = open(src).read().split("$$$$\\n")
+    for i, block in enumerate([b for b in blocks if b.strip()], start=1):
+        title = block.split("\\n", 1)[0].strip()
+        with open((title or stem + str(i)) + ".pdbqt", "w") as f:
+            f.write(block)
+""")
+
+
+class ResultZipTests(SimpleTestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        (self.root / "ligantes_pdbqt").mkdir()
+        (self.root / "gbest_pdb").mkdir()
+        self.ligands = []
+        for i in range(3):
+            lig = self.root / "ligantes_pdbqt" / f"l{i}.pdbqt"
+            lig.write_text(f"ATOM {i}\n" * 200)
+            self.ligands.append(lig)
+        (self.root / "gbest_pdb" / "l0_R1.pdbqt").write_text("MODEL 1\n")
+        (self.root / "resultado.json").write_text("{}")
+        self.zip_path = self.root / "resultado.zip"
+
+    def test_incremental_archive_is_valid(self):
+        rz = ResultZip(self.zip_path, self.root)
+        rz.add(self.ligands)
+        rz.add(self.ligands)  # repetidos são ignorados
+        rz.add([self.root / "ligantes_pdbqt" / "ausente.pdbqt"])
+        rz.add_remaining()
+        rz.close()
+
+        with zipfile.ZipFile(self.zip_path) as z:
+            self.assertIsNone(z.testzip())
+            names = z.namelist()
+            self.assertEqual(sorted(names), [
+                "gbest_pdb/l0_R1.pdbqt",
+                "ligantes_pdbqt/l0.pdbqt",
+                "ligantes_pdbqt/l1.pdbqt",
+                "ligantes_pdbqt/l2.pdbqt",
+                "resultado.json",
+            ])
+            self.assertEqual(len(names), len(set(names)))
+            self.assertEqual(z.read("ligantes_pdbqt/l1.pdbqt"), self.ligands[1].read_bytes())
+
+
+class SplitSdfTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        obabel = self.tmp / "obabel"
+        obabel.write_text(FAKE_OBABEL.format(python=sys.executable))
+        obabel.chmod(0o755)
+        patcher = mock.patch.object(tasks, "OBABEL_BIN", str(obabel))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # títulos, moléculas sem título espalhadas por vários blocos e um título repetido
+        titles = ["", "lig_a", "", "", "lig_b", "", "lig_a", "", "lig_c", "", "", ""]
+        self.sdf = self.tmp / "ligantes.sdf"
+        self.sdf.write_text("".join(
+            f"{title}\n  corpo {i}\nM  END\n$$$$\n" for i, title in enumerate(titles)
+        ))
+
+    def _split(self, name, min_mols, cpus):
+        out = self.tmp / name
+        with mock.patch.object(tasks, "OBABEL_CHUNK_MIN_MOLS", min_mols), \
+                mock.patch.object(tasks, "available_cpus", return_value=cpus):
+            files = split_sdf_to_pdbqt(self.sdf, out)
+        return [(f.name, f.read_text()) for f in files]
+
+    def test_chunked_split_matches_single_obabel(self):
+        single = self._split("single", min_mols=1000, cpus=4)
+        self.assertIn("ligantes1.pdbqt", dict(single))
+        self.assertIn("ligantes12.pdbqt", dict(single))
+        for cpus in (2, 3, 4):
+            with self.subTest(cpus=cpus):
+                self.assertEqual(self._split(f"chunked_{cpus}", min_mols=2, cpus=cpus), single)
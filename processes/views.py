@@ -1,23 +1,40 @@
 # processes/views.py
 import logging
 import shutil
+import uuid
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import quote
 
 from django.conf import settings
-from django.http import FileResponse, Http404
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header
 from rest_framework import viewsets, permissions, filters
+from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from processes.tasks import run_plasmodocking_process
-from .models import Process
+from .cache import get_cached_status, set_cached_status
+from .models import Process, ProcessStatusEnum
 from .serializers import ProcessSerializer, ProcessCreateSerializer
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _processes_base_dir() -> Path:
+    """Base dos processos já resolvida (settings não mudam em runtime; resolve() faz syscalls)."""
+    return Path(
+        getattr(settings, "PROCESSES_BASE_DIR",
+                Path(getattr(settings, "BASE_DIR")) / "files" / "processes")
+    ).resolve()
+
+
 class IsOwnerOrAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
@@ -46,7 +63,18 @@ class IsOwnerOrAdminOrReadOnly(permissions.BasePermission):
     ],
 )
 class ProcessViewSet(viewsets.ModelViewSet):
-    queryset = Process.objects.select_related("type", "user").all().order_by("-created_at")
+    # JOIN com tipo/usuário trazendo só as colunas que ProcessSerializer usa
+    # (user_detail/type_detail); password e demais colunas do User ficam de fora
+    queryset = (
+        Process.objects.select_related("type", "user")
+        .only(
+            "id", "nome", "status", "resultado_final", "pathFileSDF", "pathFileZIP",
+            "pathFileJSON", "process_dir", "created_at", "updated_at",
+            "type__id", "type__name",
+            "user__id", "user__username", "user__email", "user__first_name", "user__last_name",
+        )
+        .order_by("-created_at")
+    )
     permission_classes = [IsOwnerOrAdminOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     # continua permitindo busca livre (?search=) além dos filtros dedicados
@@ -59,6 +87,12 @@ class ProcessViewSet(viewsets.ModelViewSet):
             return ProcessCreateSerializer
         return ProcessSerializer
 
+    def filter_queryset(self, queryset):
+        # sem query string não há search/ordering a aplicar: pula os backends
+        if not self.request.query_params:
+            return queryset
+        return super().filter_queryset(queryset)
+
     def get_queryset(self):
         qs = super().get_queryset()
 
@@ -102,21 +136,69 @@ class ProcessViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         user = serializer.validated_data.get("user") or self.request.user
         instance = serializer.save(user=user)
+
+        def _enqueue():
+            # EM_FILA vai para o cache antes de publicar: um worker rápido pode
+            # gravar PROCESSANDO logo em seguida e não deve ser sobrescrito
+            set_cached_status(instance.id, ProcessStatusEnum.EM_FILA, instance.user_id)
+            try:
+                run_plasmodocking_process.apply_async(args=(str(instance.id),), ignore_result=True)
+            except Exception:
+                instance.status = "ERROR"
+                instance.save(update_fields=["status"])
+                set_cached_status(instance.id, ProcessStatusEnum.ERROR, instance.user_id)
+                raise
+
+        # Publica no broker só depois do commit (o worker nunca vê um Process inexistente)
+        transaction.on_commit(_enqueue)
+
+    @extend_schema(tags=["Processes"], responses={200: OpenApiTypes.OBJECT})
+    @action(detail=True, methods=["get"], url_path="status")
+    def status(self, request, pk=None):
+        """
+        Status leve para polling: lido do cache (Redis) atualizado pelo worker a
+        cada transição; sem entrada no cache, consulta só as colunas necessárias.
+        """
         try:
-            run_plasmodocking_process.delay(str(instance.id))
-        except Exception:
-            instance.status = "ERROR"
-            instance.save(update_fields=["status"])
-            raise
+            pk = uuid.UUID(str(pk))
+        except ValueError:
+            raise Http404
+        user = request.user
+        data = get_cached_status(pk)
+        if data is None:
+            qs = Process.objects.filter(pk=pk)
+            if not user.is_staff:
+                qs = qs.filter(user_id=user.id)
+            row = qs.values("status", "user_id", "updated_at").first()
+            if row is None:
+                raise Http404
+            data = {**row, "updated_at": row["updated_at"].isoformat()}
+        elif not user.is_staff and data["user_id"] != user.id:
+            raise Http404
+        return Response({"id": pk, "status": data["status"], "updated_at": data["updated_at"]})
 
     @action(detail=True, methods=["get"], url_path="download-zip")
     def download_zip(self, request, pk=None):
         process = self.get_object()
         if not process.pathFileZIP:
             raise Http404("Arquivo compactado ainda não está disponível.")
-        file_path = Path(process.pathFileZIP)
+        file_path = process.zip_path
         if not file_path.exists() or not file_path.is_file():
             raise Http404("Arquivo compactado não encontrado no servidor.")
+
+        accel_prefix = getattr(settings, "PROCESSES_ACCEL_REDIRECT_PREFIX", "")
+        if accel_prefix:
+            # nginx entrega o arquivo (sendfile) e o worker é liberado na hora;
+            # só redireciona caminhos dentro da base dos processos
+            try:
+                relative = file_path.resolve().relative_to(_processes_base_dir())
+            except ValueError:
+                raise Http404("Arquivo compactado não encontrado no servidor.")
+            response = HttpResponse(content_type="application/zip")
+            response["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + quote(relative.as_posix())
+            response["Content-Disposition"] = content_disposition_header(True, file_path.name)
+            return response
+
         return FileResponse(
             open(file_path, "rb"),
             as_attachment=True,
@@ -127,27 +209,25 @@ class ProcessViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         instance: Process = self.get_object()
 
-        proc_dir = None
-        if instance.pathFileSDF:
-            try:
-                proc_dir = Path(instance.pathFileSDF).parent.resolve()
-            except Exception:
-                proc_dir = None
+        # pasta gravada em save(); resolvida (symlinks inclusos) antes da checagem
+        # de contenção, pois a base também é comparada já resolvida
+        proc_dir = instance.process_dir_path
+        if proc_dir:
+            proc_dir = proc_dir.resolve()
 
-        processes_base = Path(
-            getattr(settings, "PROCESSES_BASE_DIR",
-                    Path(getattr(settings, "BASE_DIR")) / "files" / "processes")
-        ).resolve()
+        processes_base = _processes_base_dir()
 
         should_delete_dir = False
         if proc_dir and proc_dir.exists():
             try:
-                if proc_dir == processes_base or proc_dir.is_relative_to(processes_base):
-                    from django.db.models import Q
-                    siblings = Process.objects.filter(
-                        ~Q(id=instance.id),
-                        pathFileSDF__startswith=str(proc_dir)
-                    ).exists()
+                if proc_dir != processes_base and proc_dir.is_relative_to(processes_base):
+                    # outro processo na mesma pasta ou em subpasta dela impede o rmtree
+                    d = instance.process_dir
+                    siblings = (
+                        Process.objects.filter(Q(process_dir=d) | Q(process_dir__startswith=d + "/"))
+                        .exclude(id=instance.id)
+                        .exists()
+                    )
                     should_delete_dir = not siblings
                 else:
                     logger.warning("Skip delete: %s não está dentro de %s", proc_dir, processes_base)
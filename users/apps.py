@@ -4,3 +4,30 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Instancia (e memoiza) os validadores de senha no startup:
+        # o CommonPasswordValidator descompacta a lista de ~20k senhas no __init__.
+        from django.contrib.auth.password_validation import get_default_password_validators
+
+        get_default_password_validators()
+
+        # Invalidação do perfil em cache: conectada aqui para valer também no
+        # worker (saves fora das views)
+        from django.contrib.auth.signals import user_logged_in
+        from django.db.models.signals import post_delete, post_save
+
+        from djangoAPI import auth_cache
+        from .cache import on_user_changed
+
+        post_save.connect(on_user_changed, sender=self.get_model("User"),
+                          dispatch_uid="profile_cache_user_post_save")
+        post_delete.connect(on_user_changed, sender=self.get_model("User"),
+                            dispatch_uid="profile_cache_user_post_delete")
+
+        # Idem para o cache do User autenticado (djangoAPI.auth_cache)
+        post_save.connect(auth_cache.on_user_changed, sender=self.get_model("User"),
+                          dispatch_uid="auth_cache_user_post_save")
+        post_delete.connect(auth_cache.on_user_changed, sender=self.get_model("User"),
+                            dispatch_uid="auth_cache_user_post_delete")
+        user_logged_in.connect(auth_cache.on_user_changed, dispatch_uid="auth_cache_user_logged_in")
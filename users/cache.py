@@ -0,0 +1,32 @@
+# users/cache.py
+from typing import Dict, Optional
+
+from django.core.cache import cache
+
+from djangoAPI.auth_cache import user_cache_enabled
+
+PROFILE_CACHE_TTL = 300
+
+
+def _profile_key(user_id) -> str:
+    return f"user:profile:{user_id}"
+
+
+def get_cached_profile(user_id) -> Optional[Dict]:
+    """Perfil serializado do cache, ou None (serializa de novo)."""
+    # mesmo critério do cache de User: sem backend compartilhado, a invalidação
+    # não alcançaria os outros workers
+    if not user_cache_enabled():
+        return None
+    return cache.get(_profile_key(user_id))
+
+
+def set_cached_profile(user_id, data: Dict) -> None:
+    if user_cache_enabled():
+        cache.set(_profile_key(user_id), data, PROFILE_CACHE_TTL)
+
+
+def on_user_changed(sender, instance=None, **kwargs) -> None:
+    """post_save/post_delete do User (conectado em UsersConfig.ready)."""
+    if instance is not None and instance.pk is not None and user_cache_enabled():
+        cache.delete(_profile_key(instance.pk))
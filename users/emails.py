@@ -1,24 +1,67 @@
 # users/emails.py
+from functools import lru_cache
 from urllib.parse import urlencode
 import logging
+
+import requests
 from django.conf import settings
+from django.utils.html import format_html
+from requests.adapters import HTTPAdapter
+from resend.http_client import HTTPClient
 
 logger = logging.getLogger(__name__)
 
+
+class _SessionHTTPClient(HTTPClient):
+    """
+    Cliente HTTP do SDK do Resend sobre uma requests.Session com pool:
+    o padrão (requests.request) abre conexão TCP+TLS nova a cada envio.
+    """
+
+    def __init__(self, timeout=(3, 10)):
+        self._timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self._session.mount("https://", adapter)
+
+    def request(self, method, url, headers, json=None, files=None, data=None):
+        try:
+            resp = self._session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                json=json if files is None and data is None else None,
+                files=files,
+                data=data,
+                timeout=self._timeout,
+            )
+            return resp.content, resp.status_code, resp.headers
+        except requests.RequestException as e:
+            # mesmo contrato do cliente padrão: vira ResendError no SDK
+            raise RuntimeError(f"Request failed: {e}") from e
+
+
+@lru_cache(maxsize=1)
+def _resend():
+    """SDK configurado uma vez por processo (API key + cliente com keep-alive)."""
+    import resend
+    resend.api_key = settings.RESEND_API_KEY
+    resend.default_http_client = _SessionHTTPClient()
+    return resend
+
 def _build_reset_html(email: str, token: str) -> str:
-    reset_link = None
+    # format_html escapa token/link (valores vindos da requisição)
+    html = format_html(
+        "<p>Você solicitou a recuperação de senha.</p>"
+        "<p>Seu token é: <strong>{}</strong></p>",
+        token,
+    )
     if getattr(settings, "PASSWORD_RESET_URL", ""):
         qs = urlencode({"email": email, "token": token})
         reset_link = f"{settings.PASSWORD_RESET_URL}?{qs}"
-
-    html = (
-        "<p>Você solicitou a recuperação de senha.</p>"
-        f"<p>Seu token é: <strong>{token}</strong></p>"
-    )
-    if reset_link:
-        html += f'<p>Ou clique: <a href="{reset_link}">{reset_link}</a></p>'
+        html += format_html('<p>Ou clique: <a href="{0}">{0}</a></p>', reset_link)
     html += "<p>Se você não solicitou, ignore este e-mail.</p>"
-    return html
+    return str(html)
 
 
 def send_password_recovery_email(email: str, token: str) -> None:
@@ -27,7 +70,6 @@ def send_password_recovery_email(email: str, token: str) -> None:
     - Em dev (ou sem API key), faz fallback para console (log).
     Lança exceção em caso de falha real no envio.
     """
-    html = _build_reset_html(email, token)
     subject = "Recuperação de senha"
     from_email = getattr(settings, "RESEND_FROM_EMAIL", "PlasmoDocking <onboarding@resend.dev>")
 
@@ -37,21 +79,21 @@ def send_password_recovery_email(email: str, token: str) -> None:
             "Resend desativado ou em modo console. Simulando envio.",
             extra={"to": email, "subject": subject, "from": from_email}
         )
-        # Loga o “conteúdo” para dev
-        logger.info("EMAIL SIMULADO:\nFrom: %s\nTo: %s\nSubject: %s\nHTML:\n%s",
-                    from_email, email, subject, html)
+        # Loga o “conteúdo” para dev (HTML só é montado se o log for sair)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("EMAIL SIMULADO:\nFrom: %s\nTo: %s\nSubject: %s\nHTML:\n%s",
+                        from_email, email, subject, _build_reset_html(email, token))
         return
 
     # Envio real via Resend HTTP API
     try:
-        import resend
-        resend.api_key = settings.RESEND_API_KEY
+        resend = _resend()
 
         payload = {
             "from": from_email,            # precisa ser domínio verificado em prod
             "to": [email],                 # pode ser string única também
             "subject": subject,
-            "html": html,
+            "html": _build_reset_html(email, token),
         }
         resp = resend.Emails.send(payload)
         logger.info("Resend OK: %s", resp)  # resp tem id, etc.
@@ -1,6 +1,12 @@
 # users/models.py
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.db.models.functions import Lower
 
 
@@ -28,3 +34,46 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+def users_by_email(email: str):
+    """
+    Usuários com este e-mail (case-insensitive) via LOWER(email) = ..., que usa
+    o índice único users_email_ci_unique (email__iexact vira UPPER() e não usa).
+    """
+    return User.objects.alias(email_lower=Lower("email")).filter(email_lower=email.strip().lower())
+
+
+class PasswordResetToken(models.Model):
+    """
+    Token de recuperação de senha guardado no servidor: só o SHA-256 vai para
+    o banco (o token cru segue apenas no e-mail). Validar é um lookup pelo
+    índice único de token_hash, e o token pode ser revogado apagando a linha.
+    """
+    class Meta:
+        db_table = "password_reset_tokens"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="password_reset_tokens"
+    )
+    token_hash = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def hash_token(raw: str) -> str:
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user_id) -> str:
+        """Cria um token para o usuário (validade PASSWORD_RESET_TIMEOUT) e retorna o valor cru."""
+        raw = secrets.token_urlsafe(32)
+        now = timezone.now()
+        # aproveita para descartar os tokens vencidos do usuário
+        cls.objects.filter(user_id=user_id, expires_at__lte=now).delete()
+        cls.objects.create(
+            user_id=user_id,
+            token_hash=cls.hash_token(raw),
+            expires_at=now + timedelta(seconds=settings.PASSWORD_RESET_TIMEOUT),
+        )
+        return raw
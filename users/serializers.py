@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.functions import Lower
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
+from rest_framework.validators import UniqueValidator  # só a mensagem padrão
 
 from users.models import RoleEnum  # importa para default e choices
 
@@ -8,14 +10,9 @@ User = get_user_model()
 
 
 class UserSerializer(serializers.ModelSerializer):
-    username = serializers.CharField(
-        required=True,
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
-    email = serializers.EmailField(
-        required=True,
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
+    # unicidade de username/email checada numa única consulta em validate()
+    username = serializers.CharField(required=True)
+    email = serializers.EmailField(required=True)
     password = serializers.CharField(write_only=True, required=False, allow_blank=False)
 
     role = serializers.ChoiceField(choices=RoleEnum.choices, default=RoleEnum.USER, required=False)
@@ -36,6 +33,38 @@ class UserSerializer(serializers.ModelSerializer):
     def validate_email(self, value: str) -> str:
         return value.strip().lower()
 
+    def validate(self, attrs):
+        username = attrs.get("username")
+        email = attrs.get("email")
+        if self.instance is not None:
+            # no update, valor igual ao atual não precisa de checagem
+            if username == self.instance.username:
+                username = None
+            if email and email == (self.instance.email or "").lower():
+                email = None
+        cond = Q()
+        if username:
+            cond |= Q(username=username)
+        if email:
+            # LOWER(email) = ... usa o índice único users_email_ci_unique
+            cond |= Q(email_lower=email)
+        if not cond:
+            return attrs
+
+        qs = User.objects.alias(email_lower=Lower("email")).filter(cond)
+        if self.instance is not None:
+            qs = qs.exclude(pk=self.instance.pk)
+
+        errors = {}
+        for taken_username, taken_email in qs.values_list("username", "email")[:2]:
+            if username and taken_username == username:
+                errors["username"] = [UniqueValidator.message]
+            if email and taken_email.lower() == email:
+                errors["email"] = [UniqueValidator.message]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
     def create(self, validated_data):
         """
         Cadastro público:
@@ -101,4 +130,5 @@ class AuthLoginSerializer(serializers.Serializer):
 
 class AuthTokenResponseSerializer(serializers.Serializer):
     access_token = serializers.CharField()
+    refresh_token = serializers.CharField()
     token_type = serializers.CharField()
@@ -0,0 +1,21 @@
+# users/tasks.py
+import logging
+
+from celery import shared_task
+
+from .emails import send_password_recovery_email
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    name="users.send_password_recovery_email",
+    ignore_result=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,       # 1s, 2s, 4s, ... entre tentativas
+    retry_backoff_max=600,
+    max_retries=5,
+)
+def send_password_recovery_email_task(email: str, token: str) -> None:
+    """Envio do e-mail de recuperação fora da requisição (Resend pode levar centenas de ms)."""
+    send_password_recovery_email(email, token)
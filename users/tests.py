@@ -1,3 +1,216 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from djangoAPI import auth_cache
+from djangoAPI.auth_cache import CachedJWTAuthentication
+from users.cache import get_cached_profile
+from users.views_auth import AuthLoginProfileView
+from users.models import PasswordResetToken, User
+
+_CACHE_DIR = tempfile.mkdtemp(prefix="auth-cache-tests-")
+
+
+# cache compartilhado entre processos (arquivo): o cache de User fica ativo
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": _CACHE_DIR,
+}})
+class CachedJWTUserTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
+        self.auth = CachedJWTAuthentication()
+        self.token = {"user_id": 7}
+
+    def _user(self, **kwargs):
+        return User(pk=7, username="ana", email="ana@example.com", **kwargs)
+
+    def test_cached_user_is_a_fresh_instance(self):
+        with mock.patch.object(User.objects, "get", return_value=self._user()) as get:
+            first = self.auth.get_user(self.token)
+            second = self.auth.get_user(self.token)
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(second.pk, 7)
+        self.assertEqual(second.username, "ana")
+        self.assertIsNot(first, second)
+
+    def test_deactivated_user_is_rejected_after_save(self):
+        user = self._user()
+        with mock.patch.object(User.objects, "get", return_value=user):
+            self.auth.get_user(self.token)
+
+        user.is_active = False
+        post_save.send(sender=User, instance=user, created=False)
+
+        with mock.patch.object(User.objects, "get", return_value=user) as get:
+            with self.assertRaises(AuthenticationFailed):
+                self.auth.get_user(self.token)
+        self.assertEqual(get.call_count, 1)
+
+    def test_inactive_cached_row_is_rejected(self):
+        with mock.patch.object(User.objects, "get", return_value=self._user()):
+            self.auth.get_user(self.token)
+        auth_cache.cache.set(auth_cache._user_key(7), {"id": 7, "username": "ana", "is_active": False})
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_local_cache_backend_always_reads_the_database(self):
+        with mock.patch.object(User.objects, "get", return_value=self._user()) as get:
+            self.auth.get_user(self.token)
+            self.auth.get_user(self.token)
+        self.assertEqual(get.call_count, 2)
+
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": _CACHE_DIR,
+}})
+class ProfileCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
+        self.user = User(pk=9, username="ana", email="ana@example.com", role="USER")
+
+    def _profile(self):
+        request = APIRequestFactory().get(reverse("auth-login-profile"))
+        force_authenticate(request, user=self.user)
+        return AuthLoginProfileView.as_view()(request).data["user"]
+
+    def test_profile_is_cached_until_user_changes(self):
+        self.assertEqual(self._profile()["role"], "USER")
+        self.user.role = "ADMIN"
+        self.assertEqual(self._profile()["role"], "USER")  # do cache
+
+        post_save.send(sender=User, instance=self.user, created=False)
+        self.assertEqual(self._profile()["role"], "ADMIN")
+
+        post_delete.send(sender=User, instance=self.user)
+        self.assertIsNone(get_cached_profile(self.user.pk))
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_local_cache_backend_serializes_every_time(self):
+        self.assertEqual(self._profile()["role"], "USER")
+        self.user.role = "ADMIN"
+        self.assertEqual(self._profile()["role"], "ADMIN")
+        self.assertIsNone(get_cached_profile(self.user.pk))
+
+class CachedJWTTokenTests(SimpleTestCase):
+    def setUp(self):
+        auth_cache._token_cache.clear()
+        self.addCleanup(auth_cache._token_cache.clear)
+        self.auth = CachedJWTAuthentication()
+
+    def test_validated_token_expires_at_exp(self):
+        now = time.time()
+        token = {"user_id": 7, "exp": now + 5}
+        with mock.patch.object(JWTAuthentication, "get_validated_token", return_value=token) as validate:
+            with mock.patch.object(auth_cache.time, "time", return_value=now):
+                self.assertIs(self.auth.get_validated_token(b"raw"), token)
+                self.auth.get_validated_token(b"raw")
+            self.assertEqual(validate.call_count, 1)
+
+            with mock.patch.object(auth_cache.time, "time", return_value=now + 6):
+                self.auth.get_validated_token(b"raw")
+            self.assertEqual(validate.call_count, 2)
+
+    def test_validated_token_expires_after_ttl(self):
+        now = time.time()
+        token = {"user_id": 7, "exp": now + 3600}
+        with mock.patch.object(JWTAuthentication, "get_validated_token", return_value=token) as validate:
+            with mock.patch.object(auth_cache.time, "time", return_value=now):
+                self.auth.get_validated_token(b"raw")
+            with mock.patch.object(auth_cache.time, "time", return_value=now + auth_cache.TOKEN_CACHE_TTL + 1):
+                self.auth.get_validated_token(b"raw")
+        self.assertEqual(validate.call_count, 2)
+
+
+class PasswordResetTokenTests(TestCase):
+    password = "senha-antiga-123"
+    new_password = "Nova-Senha-Forte-2024"
+
+    def setUp(self):
+        cache.clear()  # contadores do throttle
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="ana", email="ana@example.com", password=self.password
+        )
+        patcher = mock.patch("users.views_password.send_password_recovery_email_task")
+        self.task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _recover(self, email):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("auth-password-recovery"), {"email": email}, format="json")
+
+    def _update(self, token, email="ana@example.com", password=None):
+        return self.client.post(reverse("auth-password-update"), {
+            "email": email, "token": token, "newPassword": password or self.new_password,
+        }, format="json")
+
+    def _issued_token(self):
+        response = self._recover("Ana@Example.com")
+        self.assertEqual(response.status_code, 200)
+        self.task.delay.assert_called_once()
+        email, token = self.task.delay.call_args.args
+        self.assertEqual(email, "ana@example.com")
+        return token
+
+    def test_issue_then_use(self):
+        token = self._issued_token()
+        stored = PasswordResetToken.objects.get(user=self.user)
+        self.assertNotEqual(stored.token_hash, token)  # só o hash vai para o banco
+        self.assertEqual(stored.token_hash, PasswordResetToken.hash_token(token))
+
+        response = self._update(token)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password(self.new_password))
+        self.assertFalse(PasswordResetToken.objects.filter(user=self.user).exists())
+
+    def test_reused_token_is_rejected(self):
+        token = self._issued_token()
+        self.assertEqual(self._update(token).status_code, 200)
+
+        response = self._update(token, password="Outra-Senha-Forte-2024")
+        self.assertEqual(response.status_code, 400)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password(self.new_password))
+
+    def test_expired_token_is_rejected(self):
+        token = self._issued_token()
+        PasswordResetToken.objects.filter(user=self.user).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(self._update(token).status_code, 400)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password(self.password))
+
+    def test_token_of_another_user_is_rejected(self):
+        token = self._issued_token()
+        User.objects.create_user(username="bia", email="bia@example.com", password=self.password)
+        self.assertEqual(self._update(token, email="bia@example.com").status_code, 400)
+
+    def test_unknown_email_still_returns_200(self):
+        response = self._recover("ninguem@example.com")
+        self.assertEqual(response.status_code, 200)
+        self.task.delay.assert_not_called()
+        self.assertFalse(PasswordResetToken.objects.exists())
+
+    def test_broker_failure_still_returns_200(self):
+        self.task.delay.side_effect = OperationalError("broker down")
+        with self.assertLogs("users.views_password", level="ERROR"):
+            response = self._recover("ana@example.com")
+        self.assertEqual(response.status_code, 200)
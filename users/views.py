@@ -44,6 +44,12 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ["username", "email", "first_name", "last_name"]
     ordering_fields = ["username", "date_joined", "last_login"]
 
+    def filter_queryset(self, queryset):
+        # sem query string não há search/ordering a aplicar: pula os backends
+        if not self.request.query_params:
+            return queryset
+        return super().filter_queryset(queryset)
+
     def get_permissions(self):
         # Torna a ação de criação pública
         if self.action == "create":
@@ -1,13 +1,19 @@
 # users/views_auth.py
+from functools import lru_cache
+
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import check_password, make_password
+from django.utils.crypto import get_random_string
 from rest_framework import permissions, status
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 
 from drf_spectacular.utils import extend_schema
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .cache import get_cached_profile, set_cached_profile
+from .models import users_by_email
 from .serializers import (
     AuthLoginSerializer,
     AuthTokenResponseSerializer,
@@ -17,9 +23,10 @@ from .serializers import (
 User = get_user_model()
 
 
-def _bool_attr(obj, name, default=True):
-    # util: lida com campos custom como 'active' coexistindo com 'is_active'
-    return getattr(obj, name, default)
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """Hash descartável com o hasher atual, gerado uma vez por processo."""
+    return make_password(get_random_string(32))
 
 
 @extend_schema(
@@ -35,6 +42,8 @@ class AuthLoginPasswordView(APIView):
     """
     permission_classes = [permissions.AllowAny]
     authentication_classes = []  # ← desativa autenticação aqui
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "login"
 
     def post(self, request):
         serializer = AuthLoginSerializer(data=request.data)
@@ -42,16 +51,26 @@ class AuthLoginPasswordView(APIView):
         email = serializer.validated_data["email"].strip()
         password = serializer.validated_data["password"]
 
-        user = User.objects.filter(email__iexact=email).first()
-        if not user or not check_password(password, user.password):
+        # só as colunas lidas aqui (senha, flags de ativo e o id para o token), sem montar o User
+        row = users_by_email(email).values("id", "password", "is_active", "deleted").first()
+        if not row:
+            # mesmo custo de hash que um e-mail existente (sem oráculo de tempo)
+            check_password(password, _dummy_password_hash())
+            return Response({"detail": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
+        if not check_password(password, row["password"]):
             return Response({"detail": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
 
-        if not user.is_active or not _bool_attr(user, "active", True) or _bool_attr(user, "deleted", False):
+        if not row["is_active"] or row["deleted"]:
             return Response({"detail": "User is inactive or deleted"}, status=status.HTTP_401_UNAUTHORIZED)
 
-        access = RefreshToken.for_user(user).access_token
+        # for_user só lê o id
+        refresh = RefreshToken.for_user(User(pk=row["id"]))
         return Response(
-            {"access_token": str(access), "token_type": "Bearer"},
+            {
+                "access_token": str(refresh.access_token),
+                "refresh_token": str(refresh),
+                "token_type": "Bearer",
+            },
             status=status.HTTP_200_OK,
         )
 
@@ -67,5 +86,9 @@ class AuthLoginProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        data = UserSerializer(request.user).data
+        # perfil serializado no cache compartilhado (Redis), apagado ao salvar/remover o User
+        data = get_cached_profile(request.user.pk)
+        if data is None:
+            data = dict(UserSerializer(request.user).data)
+            set_cached_profile(request.user.pk, data)
         return Response({"user": data}, status=status.HTTP_200_OK)
@@ -1,20 +1,24 @@
 # users/views_password.py
+import logging
+
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.utils import timezone
-from django.utils.crypto import constant_time_compare
-from django.contrib.auth.tokens import default_token_generator
 
+from kombu.exceptions import OperationalError
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from drf_spectacular.utils import extend_schema
-from resend.exceptions import ResendError 
 
 from .serializers_password import PasswordRecoverySerializer, PasswordUpdateSerializer
-from .emails import send_password_recovery_email
+from .models import PasswordResetToken, users_by_email
+from .tasks import send_password_recovery_email_task
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -22,33 +26,34 @@ User = get_user_model()
 @extend_schema(
     tags=["Auth"],
     request=PasswordRecoverySerializer,
-    responses={200: {"type": "object", "properties": {"message": {"type": "string"}}},
-               404: {"type": "object", "properties": {"detail": {"type": "string"}}}},
+    responses={200: {"type": "object", "properties": {"message": {"type": "string"}}}},
 )
 class PasswordRecoveryView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "password_recovery"
 
     def post(self, request):
         ser = PasswordRecoverySerializer(data=request.data)
         ser.is_valid(raise_exception=True)
         email = ser.validated_data["email"].strip().lower()
 
-        user = User.objects.filter(email__iexact=email).first()
-        if not user:
-            # Se quiser não revelar existência, retorne 200 sempre:
-            # return Response({"message": "Email with recovery code sent successfully"}, status=200)
-            return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+        user_id = users_by_email(email).values_list("id", flat=True).first()
+        # Sempre 200: não revela se o e-mail existe. O envio vai para a fila
+        # (com retry/backoff no worker) em vez de bloquear a requisição no Resend.
+        if user_id is not None:
+            with transaction.atomic():
+                token = PasswordResetToken.issue(user_id)
 
-        token = default_token_generator.make_token(user)
+                def _enqueue():
+                    # broker fora do ar não pode virar 500 (revelaria que o e-mail existe)
+                    try:
+                        send_password_recovery_email_task.delay(email, token)
+                    except OperationalError:
+                        logger.exception("Falha ao enfileirar e-mail de recuperação de senha")
 
-        try:
-            send_password_recovery_email(email, token)
-        except ResendError as e:
-            # erro do Resend (credenciais, domínio não verificado etc.)
-            return Response({"detail": "Email service error"}, status=status.HTTP_502_BAD_GATEWAY)
-        except Exception as e:
-            # outros erros (rede, DNS, etc.)
-            return Response({"detail": "Internal email error"}, status=status.HTTP_502_BAD_GATEWAY)
+                # só publica depois que o token está gravado
+                transaction.on_commit(_enqueue)
 
         return Response({"message": "Email with recovery code sent successfully"}, status=status.HTTP_200_OK)
 
@@ -67,6 +72,8 @@ class PasswordUpdateView(APIView):
     resp: { "message": "Password updated successfully" }
     """
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "password_update"
 
     def post(self, request):
         ser = PasswordUpdateSerializer(data=request.data)
@@ -76,12 +83,20 @@ class PasswordUpdateView(APIView):
         new_password = ser.validated_data["newPassword"]
         token = ser.validated_data["token"]
 
-        user = User.objects.filter(email__iexact=email).first()
+        # só id/senha: os validadores configurados não olham atributos do usuário
+        user = users_by_email(email).only("id", "password").first()
         if not user:
             return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # valida token (estateless; depende do hash da senha/last_login etc.)
-        if not default_token_generator.check_token(user, token):
+        # valida token: lookup pelo hash (índice único), dono e validade
+        token_hash = PasswordResetToken.hash_token(token)
+        token_user_id = (
+            PasswordResetToken.objects
+            .filter(token_hash=token_hash, expires_at__gt=timezone.now())
+            .values_list("user_id", flat=True)
+            .first()
+        )
+        if token_user_id != user.id:
             return Response({"detail": "Invalid or expired token"}, status=status.HTTP_400_BAD_REQUEST)
 
         # valida força da senha (usa validadores do Django)
@@ -90,8 +105,14 @@ class PasswordUpdateView(APIView):
         except DjangoValidationError as e:
             return Response({"detail": e.messages}, status=status.HTTP_400_BAD_REQUEST)
 
-        # troca a senha (isso automaticamente invalida o token do gerador)
-        user.set_password(new_password)
-        user.save(update_fields=["password"])
+        # troca a senha e revoga os tokens do usuário; se outra requisição já
+        # consumiu este token, nada é apagado e a troca não acontece
+        with transaction.atomic():
+            deleted, _ = PasswordResetToken.objects.filter(token_hash=token_hash, user_id=user.id).delete()
+            if not deleted:
+                return Response({"detail": "Invalid or expired token"}, status=status.HTTP_400_BAD_REQUEST)
+            PasswordResetToken.objects.filter(user_id=user.id).delete()
+            user.set_password(new_password)
+            user.save(update_fields=["password"])
 
         return Response({"message": "Password updated successfully"}, status=status.HTTP_200_OK)
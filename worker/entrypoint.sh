@@ -29,8 +29,9 @@ until nc -z "$RABBITMQ_HOST" "$RABBITMQ_PORT"; do sleep 1; done
 
 # Parâmetros Celery
 CELERY_APP="${CELERY_APP:-djangoAPI}"
-CELERY_QUEUE="${CELERY_QUEUE:-default}"
+CELERY_QUEUE="${CELERY_QUEUE:-default,${CELERY_GPU_QUEUE:-docking_gpu}}"
 CELERY_CONCURRENCY="${CELERY_CONCURRENCY:-1}"
+CELERY_PREFETCH_MULTIPLIER="${CELERY_PREFETCH_MULTIPLIER:-1}"
 CELERY_LOGLEVEL="${CELERY_LOGLEVEL:-info}"
 
 echo "[worker] starting celery worker"
@@ -38,4 +39,5 @@ exec celery -A "${CELERY_APP}" worker \
   -l "${CELERY_LOGLEVEL}" \
   -Q "${CELERY_QUEUE}" \
   -n "worker@%h" \
-  --concurrency="${CELERY_CONCURRENCY}"
+  --concurrency="${CELERY_CONCURRENCY}" \
+  --prefetch-multiplier="${CELERY_PREFETCH_MULTIPLIER}"